@@ -10,6 +10,8 @@ import os
 import sys
 import importlib.util
 
+from stock_log import setup_logging
+
 
 def import_module(module_name, file_path):
     """
@@ -169,6 +171,9 @@ def analyze_stock_directly(symbol, analysis_type="comprehensive"):
 
 def main():
     """主函数"""
+    # 日志输出只在程序入口配置
+    setup_logging()
+    
     # 获取当前脚本所在的目录
     current_dir = os.path.dirname(os.path.abspath(__file__))
     
@@ -132,18 +132,19 @@ class PromptManager:
         
         # 构建经验规则部分
         experience_rules = self.prompts.get("experience_rules", [])
-        rules_text = "\n【经验规则总结】\n"
+        # 各片段先收集到列表，最后统一join，避免循环内反复拼接字符串
+        rules_parts = ["\n【经验规则总结】\n"]
         
         if experience_rules:
             for i, rule_data in enumerate(experience_rules[-10:], 1):  # 只取最近10条
                 rule = rule_data.get("rule", "")
                 source = rule_data.get("source", "")
-                rules_text += f"{i}. {rule}"
+                rules_parts.append(f"{i}. {rule}")
                 if source:
-                    rules_text += f" (来源: {source})"
-                rules_text += "\n"
+                    rules_parts.append(f" (来源: {source})")
+                rules_parts.append("\n")
         else:
-            rules_text += "暂无经验规则，请手动添加。\n"
+            rules_parts.append("暂无经验规则，请手动添加。\n")
         
         # 准备数据
         symbol = stock_data.get("symbol", "")
@@ -153,21 +154,18 @@ class PromptManager:
         key_metrics = stock_data.get("key_metrics", {})
         
         # 格式化关键指标
-        key_metrics_str = "\n".join([f"{k}: {v}" for k, v in key_metrics.items()])
+        key_metrics_str = "\n".join(f"{k}: {v}" for k, v in key_metrics.items())
         
-        # 填充模板
-        prompt = basic_template.format(
+        # 填充模板，并追加经验规则
+        rules_parts.insert(0, basic_template.format(
             symbol=symbol,
             name=name,
             analysis_date=analysis_date,
             history_summary=history_summary,
             key_metrics=key_metrics_str
-        )
+        ))
         
-        # 添加经验规则
-        prompt += rules_text
-        
-        return prompt
+        return "".join(rules_parts)
     
     def update_from_llm(self, case_text: str, llm_response: str):
         """
@@ -8,6 +8,9 @@ import os
 import sys
 from typing import Optional, List, Tuple, Dict, Any
 
+# 多行输入只在stock_ui_input中定义一份，这里导入以保持原有接口
+from stock_ui_input import get_multiline_input
+
 # 导入格式化模块
 try:
     from stock_ui_formatters import format_analysis_result
@@ -174,38 +177,6 @@ def get_menu_choice() -> str:
         else:
             print("无效选项，请重新输入")
 
-def get_multiline_input(prompt: str, end_marker: str = "END") -> str:
-    """
-    获取多行输入，直到遇到结束标记
-    
-    Args:
-        prompt: 提示信息
-        end_marker: 结束标记（用户输入这个标记表示输入结束）
-    
-    Returns:
-        用户输入的多行文本（不包含结束标记）
-    """
-    print(prompt)
-    print(f"输入完成后，请在新的一行单独输入 '{end_marker}' 并按回车结束输入")
-    print("开始输入:")
-    
-    lines = []
-    while True:
-        try:
-            line = input()
-            # 清理不可编码字符
-            cleaned_line = line.encode('utf-8', 'ignore').decode('utf-8')
-            if cleaned_line.strip() == end_marker:
-                break
-            lines.append(cleaned_line)
-        except EOFError:
-            # 用户按Ctrl+D/Ctrl+Z
-            print(f"\n检测到输入结束")
-            break
-    
-    return "\n".join(lines)
-
-
 # ==================== 主UI模块 ====================
 def run_analysis(stock_monitor, stock_data_fetcher):
     """
@@ -359,6 +330,8 @@ def main_ui(stock_monitor, stock_data_fetcher):
 
 if __name__ == "__main__":
     # 主程序入口
+    from stock_log import setup_logging
+    setup_logging()
     print("股票分析UI模块启动...")
     
     # 尝试导入必要的模块
@@ -6,12 +6,50 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import akshare as ak
 import warnings
 warnings.filterwarnings('ignore')
 
+from stock_limit_pool import get_limit_pool
+
+# 可选的Numba JIT加速，未安装时退化为普通Python函数
+from utils._njit import njit
+
+# 涨停类型编码 -> 名称（与_classify_limits的返回值对应）
+_LIMIT_TYPE_LABELS = ("非涨停", "一字板", "T字板", "普通涨停")
+
+
+@njit(cache=True)
+def _classify_limits(op, cl, hi, lo, pct):
+    """
+    批量判断每日是否涨停及涨停类型
+    
+    Returns:
+        (是否涨停数组, 涨停类型编码数组)，编码含义见_LIMIT_TYPE_LABELS
+    """
+    n = pct.shape[0]
+    is_lu = np.empty(n, np.bool_)
+    typ = np.empty(n, np.int8)
+    for i in range(n):
+        lu = (abs(pct[i] - 10.0) < 0.5) or (pct[i] >= 9.8)
+        is_lu[i] = lu
+        if not lu:
+            typ[i] = 0
+            continue
+        # 计算前一日收盘价（近似）及涨停价
+        prev = cl[i] / (1 + pct[i] / 100) if pct[i] != 0 else cl[i]
+        lp = prev * 1.1
+        if abs(op[i] - lp) < 0.01 and abs(hi[i] - lp) < 0.01:
+            typ[i] = 1
+        elif abs(hi[i] - lp) < 0.01 and lo[i] < op[i]:
+            typ[i] = 2
+        else:
+            typ[i] = 3
+    return is_lu, typ
+
+
 class StockDataCollector:
     """股票数据收集器"""
     
@@ -94,9 +132,9 @@ class StockDataCollector:
         try:
             stock_info = ak.stock_individual_info_em(symbol=symbol)
             if not stock_info.empty:
-                for _, row in stock_info.iterrows():
-                    if row['item'] == '股票简称':
-                        return row['value']
+                for item, value in zip(stock_info['item'], stock_info['value']):
+                    if item == '股票简称':
+                        return value
             return symbol
         except:
             return symbol
@@ -151,60 +189,47 @@ class StockDataCollector:
                 '涨跌额': 'change',
                 '换手率': 'turnover'
             })
-            
-            # 按日期排序（最近的在前）
-            df = df.sort_values('date', ascending=False)
-            
-            # 按日期排序（最近的在前）
-            df = df.sort_values('date', ascending=False)
-            
-            # 只保留最近days_back天的数据（相对于目标日期）
-            df = df.head(days_back)
+
+            # 一次性向量化解析日期，剔除目标日期之后的数据（避免逐行strptime）
+            dates = pd.to_datetime(df['date'], errors='coerce')
+            future = dates > pd.Timestamp(query_date.date())
+            if future.any():
+                print(f"警告: 检测到目标日期之后的数据: {df.loc[future, 'date'].tolist()}")
+                df = df[~future]
+                dates = dates[~future]
+
+            # 只保留最近days_back天的数据（相对于目标日期），最近的在前
+            # nlargest为部分选择，无需对整个DataFrame排序
+            df = df.loc[dates.nlargest(days_back).index]
             
             # 转换为字典列表
             history_list = []
-            for _, row in df.iterrows():
-                # 判断是否涨停
-                pct_change = row.get('pct_change', 0)
-                is_limit_up = False
-                if isinstance(pct_change, (int, float)):
-                    is_limit_up = abs(pct_change - 10.0) < 0.5 or pct_change >= 9.8
-                
-                # 判断涨停类型
-                limit_type = "非涨停"
-                if is_limit_up:
-                    open_price = row.get('open', 0)
-                    close_price = row.get('close', 0)
-                    high_price = row.get('high', 0)
-                    low_price = row.get('low', 0)
-                    
-                    # 计算前一日收盘价（近似）
-                    prev_close = close_price / (1 + pct_change/100) if pct_change != 0 else close_price
-                    
-                    # 计算涨停价
-                    limit_price = prev_close * 1.1
-                    
-                    # 判断是否一字板
-                    if abs(open_price - limit_price) < 0.01 and abs(high_price - limit_price) < 0.01:
-                        limit_type = "一字板"
-                    # 判断是否T字板
-                    elif abs(high_price - limit_price) < 0.01 and low_price < open_price:
-                        limit_type = "T字板"
-                    else:
-                        limit_type = "普通涨停"
+            # 一次性把各列转换为numpy数组，循环内按下标取值，避免逐行的字典/Series查找
+            dates_arr = df['date'].to_numpy()
+            num_cols = ['open', 'close', 'high', 'low', 'volume', 'amount', 'pct_change', 'turnover']
+            arrs = {
+                c: pd.to_numeric(df[c], errors='coerce').to_numpy(dtype=float) if c in df.columns else np.zeros(len(df))
+                for c in num_cols
+            }
+            # 涨停判断与类型分类在数组上批量完成（安装numba时为机器码）
+            is_lu_arr, typ_arr = _classify_limits(
+                arrs['open'], arrs['close'], arrs['high'], arrs['low'], arrs['pct_change']
+            )
+            for i in range(len(df)):
+                turnover = float(arrs['turnover'][i])
                 
                 history_list.append({
-                    'date': row['date'],
-                    'open': float(row['open']),
-                    'close': float(row['close']),
-                    'high': float(row['high']),
-                    'low': float(row['low']),
-                    'volume': float(row['volume']),
-                    'amount': float(row['amount']),
-                    'pct_change': float(pct_change),
-                    'turnover': float(row['turnover']) if 'turnover' in row and pd.notna(row['turnover']) else 0.0,
-                    'is_limit_up': is_limit_up,
-                    'limit_type': limit_type
+                    'date': dates_arr[i],
+                    'open': float(arrs['open'][i]),
+                    'close': float(arrs['close'][i]),
+                    'high': float(arrs['high'][i]),
+                    'low': float(arrs['low'][i]),
+                    'volume': float(arrs['volume'][i]),
+                    'amount': float(arrs['amount'][i]),
+                    'pct_change': float(arrs['pct_change'][i]),
+                    'turnover': turnover if pd.notna(turnover) else 0.0,
+                    'is_limit_up': bool(is_lu_arr[i]),
+                    'limit_type': _LIMIT_TYPE_LABELS[typ_arr[i]]
                 })
             
             return history_list
@@ -227,8 +252,9 @@ class StockDataCollector:
             else:
                 current_date = datetime.now().strftime('%Y%m%d')
             
-            # 获取指定日期的涨停板池数据
-            df_today = ak.stock_zt_pool_em(date=current_date)
+            # 获取指定日期的涨停板池数据（与其他模块共用按日期的缓存，按代码索引）
+            pool = get_limit_pool(current_date)
+            rows = pool['rows'] if pool is not None else {}
             
             result = {
                 'in_today_pool': False,
@@ -237,41 +263,29 @@ class StockDataCollector:
                 'blow_up_count': 0
             }
             
-            if df_today is not None and not df_today.empty:
-                # 查找代码列
-                code_col = None
-                for col in ['代码', 'symbol', '股票代码']:
-                    if col in df_today.columns:
-                        code_col = col
-                        break
+            stock_row = rows.get(symbol)
+            if stock_row is not None:
+                result['in_today_pool'] = True
+                
+                # 获取连板数
+                for col in ['连板数', '连续涨停天数']:
+                    if col in stock_row and pd.notna(stock_row[col]):
+                        try:
+                            result['streak_days'] = int(stock_row[col])
+                            break
+                        except:
+                            continue
                 
-                if code_col:
-                    df_today[code_col] = df_today[code_col].astype(str).str.zfill(6)
-                    if symbol in df_today[code_col].values:
-                        result['in_today_pool'] = True
-                        
-                        # 获取该股票的数据
-                        stock_row = df_today[df_today[code_col] == symbol].iloc[0]
-                        
-                        # 获取连板数
-                        for col in ['连板数', '连续涨停天数']:
-                            if col in stock_row and pd.notna(stock_row[col]):
-                                try:
-                                    result['streak_days'] = int(stock_row[col])
-                                    break
-                                except:
-                                    continue
-                        
-                        # 获取首次封板时间
-                        if '首次封板时间' in stock_row:
-                            result['first_limit_time'] = str(stock_row['首次封板时间'])
-                        
-                        # 获取炸板次数
-                        if '炸板次数' in stock_row:
-                            try:
-                                result['blow_up_count'] = int(stock_row['炸板次数'])
-                            except:
-                                pass
+                # 获取首次封板时间
+                if '首次封板时间' in stock_row:
+                    result['first_limit_time'] = str(stock_row['首次封板时间'])
+                
+                # 获取炸板次数
+                if '炸板次数' in stock_row:
+                    try:
+                        result['blow_up_count'] = int(stock_row['炸板次数'])
+                    except:
+                        pass
             
             return result
             
@@ -286,21 +300,13 @@ class StockDataCollector:
         if not history_data:
             return {}
         
-        # 提取最近3天的数据
-        recent_days = min(3, len(history_data))
-        recent_data = history_data[:recent_days]
-        
-        # 计算换手率趋势
+        # 单次遍历最近3天的数据，同时统计换手率和涨停天数
         turnover_rates = []
-        for day in recent_data:
-            if 'turnover' in day:
-                turnover = day['turnover']
-                if isinstance(turnover, (int, float)):
-                    turnover_rates.append(turnover)
-        
-        # 计算涨停天数
         limit_up_days = 0
-        for day in recent_data:
+        for day in history_data[:3]:
+            turnover = day.get('turnover')
+            if isinstance(turnover, (int, float)):
+                turnover_rates.append(turnover)
             if day.get('is_limit_up', False):
                 limit_up_days += 1
         
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+涨停板池加载模块 - 连板计算、异动分析、综合分析和数据收集共用
+
+同一日期的涨停板池对所有股票相同，按日期在进程内缓存，并保存到本地缓存文件
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from stock_log import get_logger
+
+logger = get_logger("limit_pool")
+
+try:
+    import akshare as ak
+except ImportError:
+    ak = None
+
+# 涨停板池缓存优先使用Parquet格式（保留类型、可只读取部分列），未安装pyarrow时回退到CSV
+try:
+    import pyarrow  # noqa: F401
+    _CACHE_EXT = "parquet"
+except ImportError:
+    _CACHE_EXT = "csv"
+
+# 涨停板池本地缓存目录
+LIMIT_POOL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stock_data_cache")
+
+# 缓存文件保存的列（各模块用到的字段）
+_CACHE_COLUMNS = ('代码', '名称', '连板数', '首次封板时间', '炸板次数')
+
+# 接口可能返回的代码列、连板数列（按优先级排列）
+_CODE_COLUMNS = ('代码', 'symbol', '股票代码')
+_STREAK_COLUMNS = ('连板数', '连续涨停天数')
+
+# 内存缓存和盘中写入的缓存文件1小时过期；收盘数据更新（16点）后写入的缓存文件一直有效
+_TTL = 3600
+_MAX_DATES = 64
+_DATA_UPDATE_HOUR = 16
+_TZ_SHANGHAI = ZoneInfo('Asia/Shanghai')
+
+# {日期: (获取时间, 涨停板池数据)}，无数据的日期不缓存
+_cache: Dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def _cache_file(date_str: str, ext: str = _CACHE_EXT) -> str:
+    return os.path.join(LIMIT_POOL_CACHE_DIR, f"limit_pool_{date_str}.{ext}")
+
+
+def _cache_file_fresh(path: str, date_str: str) -> bool:
+    """缓存文件是否可用：当日数据更新后写入的一直有效，之前（盘中）写入的1小时内有效"""
+    mtime = os.path.getmtime(path)
+    final_ts = datetime.strptime(date_str, '%Y%m%d').replace(
+        hour=_DATA_UPDATE_HOUR, tzinfo=_TZ_SHANGHAI).timestamp()
+    return mtime >= final_ts or time.time() - mtime < _TTL
+
+
+def _read_cache_file(date_str: str) -> Optional[pd.DataFrame]:
+    """读取本地缓存的涨停板池，缓存不存在、已过期或无效时返回None"""
+    for ext in ('parquet', 'csv'):
+        path = _cache_file(date_str, ext)
+        if not os.path.exists(path):
+            continue
+        try:
+            if not _cache_file_fresh(path, date_str):
+                continue
+            if ext == 'parquet':
+                df = pd.read_parquet(path)
+            else:
+                # 代码按字符串读取，避免前导0丢失
+                df = pd.read_csv(path, dtype={'代码': str})
+            if df is not None and not df.empty:
+                return df
+        except Exception as e:
+            logger.error("读取涨停板池缓存失败: %s", e)
+    return None
+
+
+def _write_cache_file(date_str: str, df: pd.DataFrame):
+    """把涨停板池写入本地缓存文件（只保存各模块用到的列）"""
+    try:
+        os.makedirs(LIMIT_POOL_CACHE_DIR, exist_ok=True)
+        cached = df[[col for col in _CACHE_COLUMNS if col in df.columns]]
+        if _CACHE_EXT == "parquet":
+            cached.to_parquet(_cache_file(date_str), compression='zstd', index=False)
+        else:
+            cached.to_csv(_cache_file(date_str), index=False, encoding='utf-8-sig')
+    except Exception as e:
+        logger.error("保存涨停板池缓存失败: %s", e)
+
+
+def _build_pool(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    按代码整理涨停板池
+
+    Returns:
+        {'codes': 6位代码的frozenset, 'streaks': {代码: 连板数}, 'rows': {代码: 行数据}}
+    """
+    code_col = next((col for col in _CODE_COLUMNS if col in df.columns), None)
+    if code_col is None:
+        return {'codes': frozenset(), 'streaks': {}, 'rows': {}}
+
+    df = df.copy()
+    # numpy向量化补0，不逐行调用pandas字符串方法
+    df[code_col] = np.char.zfill(df[code_col].to_numpy().astype('U6'), 6)
+    # 同一代码取第一行
+    df = df.drop_duplicates(subset=code_col)
+    codes = df[code_col].tolist()
+
+    streaks = {}
+    for col in _STREAK_COLUMNS:
+        if col not in df.columns:
+            continue
+        for code, value in zip(codes, df[col]):
+            if code in streaks or pd.isna(value):
+                continue
+            try:
+                streaks[code] = int(value)
+            except (TypeError, ValueError):
+                pass
+
+    return {
+        'codes': frozenset(codes),
+        'streaks': streaks,
+        'rows': df.set_index(code_col).to_dict(orient='index'),
+    }
+
+
+def get_limit_pool(date_str: str) -> Optional[Dict[str, Any]]:
+    """
+    获取指定日期的涨停板池（进程内按日期缓存1小时）
+
+    优先读取本地缓存文件，没有可用的缓存文件时从接口获取并写入缓存文件；
+    无数据（可能是非交易日或尚未发布）不缓存，下次重新获取
+
+    Args:
+        date_str: 日期字符串 (YYYYMMDD)
+
+    Returns:
+        {'codes': 6位代码的frozenset, 'streaks': {代码: 连板数}, 'rows': {代码: 行数据}}；
+        无数据时返回None
+
+    Raises:
+        接口调用失败时抛出异常（未安装akshare时为ImportError）
+    """
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(date_str)
+    if cached is not None and now - cached[0] < _TTL:
+        return cached[1]
+
+    df = _read_cache_file(date_str)
+    if df is None:
+        if ak is None:
+            raise ImportError("未安装akshare，无法获取涨停板池")
+        df = ak.stock_zt_pool_em(date=date_str)
+        if df is None or df.empty:
+            return None
+        _write_cache_file(date_str, df)
+
+    pool = _build_pool(df)
+    with _lock:
+        if date_str not in _cache and len(_cache) >= _MAX_DATES:
+            # 淘汰最早获取的日期
+            oldest = min(_cache, key=lambda d: _cache[d][0])
+            del _cache[oldest]
+        _cache[date_str] = (now, pool)
+    return pool
+
+
+def get_limit_pool_codes(date_str: str) -> Optional[frozenset]:
+    """
+    指定日期涨停板池中的6位股票代码集合
+
+    Returns:
+        代码集合；无数据（可能是非交易日）时返回None，接口调用失败时抛出异常
+    """
+    pool = get_limit_pool(date_str)
+    return None if pool is None else pool['codes']
@@ -8,6 +8,10 @@
 import os
 import sys
 import json
+import string
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
@@ -16,12 +20,19 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
+from stock_log import get_logger, flush_logs, setup_logging
+
+logger = get_logger("llm_analyzer")
+
+# 调试输出的分隔线
+_SEPARATOR = "=" * 60
+
 # 导入新模块
 try:
     from stock_llm_core import StockLLMCore
     from stock_data_collector import StockDataCollector
 except ImportError:
-    print("警告: 无法导入核心模块，某些功能可能不可用")
+    logger.warning("警告: 无法导入核心模块，某些功能可能不可用")
     StockLLMCore = None
     StockDataCollector = None
 
@@ -29,14 +40,38 @@ except ImportError:
 try:
     from prompt_manager import prompt_manager, get_enhanced_prompt_for_stock, update_prompt_from_case
 except ImportError:
-    print("提示词管理器模块导入失败，将使用基本功能")
+    logger.warning("提示词管理器模块导入失败，将使用基本功能")
     def get_enhanced_prompt_for_stock(stock_data):
         return "基本提示词"
     def update_prompt_from_case(symbol, stock_data, analysis_result):
-        print(f"记录案例: {symbol}")
+        logger.info("记录案例: %s", symbol)
         return True
     prompt_manager = None
 
+# 尝试使用orjson加速JSON序列化，未安装时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_text(data: Any) -> str:
+    """将数据序列化为缩进格式的JSON文本（用于拼入提示词，优先使用orjson）"""
+    if orjson:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(data, default=str, option=option).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2, default=str)
+
+
+def _write_json_file(filename, data: Any):
+    """将数据以缩进格式写入JSON文件（优先使用orjson）"""
+    if orjson:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
 class StockLLMAnalyzer:
     """股票LLM智能分析器（精简版）"""
     
@@ -55,14 +90,26 @@ class StockLLMAnalyzer:
         
         # 检查API密钥
         if not api_key and llm_provider != "local":
-            print(f"警告: 未提供{llm_provider} API密钥")
+            logger.warning("警告: 未提供%s API密钥", llm_provider)
         
         # 初始化核心模块
         self.llm_core = StockLLMCore(llm_provider, api_key, base_url) if StockLLMCore else None
         self.data_collector = StockDataCollector() if StockDataCollector else None
         
+        # 策略和经验的保存目录，构造时创建一次，保存时不再逐次检查
+        self._strategy_dir = Path("quant_strategies")
+        self._experience_dir = Path("stock_experiences")
+        self._strategy_dir.mkdir(parents=True, exist_ok=True)
+        self._experience_dir.mkdir(parents=True, exist_ok=True)
+        
         # 加载经验提示词
         self.experience_prompts = self._load_experience_prompts()
+        # 模板与具体规则均为常量，构造时拼接一次，避免每次构建提示词时重复拼接
+        self._full_template = self.experience_prompts["basic_template"] + self.experience_prompts["specific_rules"]
+        # 预先把模板解析为(字面文本, 字段名)片段，构建提示词时按片段填充，无需每次重新解析模板
+        self._template_segments = tuple(
+            (literal, field_name) for literal, field_name, _, _ in string.Formatter().parse(self._full_template)
+        )
     
     def _load_experience_prompts(self) -> Dict[str, str]:
         """加载经验提示词"""
@@ -157,22 +204,22 @@ class StockLLMAnalyzer:
         """
         try:
             # 1. 数据收集功能
-            print(f"【数据收集】正在收集 {symbol} 的股票数据...")
+            logger.info("【数据收集】正在收集 %s 的股票数据...", symbol)
             stock_data = self.collect_stock_data(symbol)
             
             if "error" in stock_data:
                 return {"error": stock_data["error"]}
             
-            print(f"✓ 数据收集完成: {stock_data.get('name', symbol)}")
+            logger.info("✓ 数据收集完成: %s", stock_data.get('name', symbol))
             
             # 2. 构建增强提示词
-            print(f"【提示词构建】正在构建分析提示词...")
+            logger.info("【提示词构建】正在构建分析提示词...")
             if prompt_manager:
                 base_prompt = get_enhanced_prompt_for_stock(stock_data)
-                print("✓ 使用提示词管理器构建提示词")
+                logger.info("✓ 使用提示词管理器构建提示词")
             else:
                 base_prompt = self._build_llm_prompt(stock_data)
-                print("✓ 使用内置模板构建提示词")
+                logger.info("✓ 使用内置模板构建提示词")
             
             # 获取规律总结（如果可用）
             pattern_summary = ""
@@ -192,9 +239,9 @@ class StockLLMAnalyzer:
 
 请参考以上用户指定的规律，结合当前股票数据进行对比分析。"""
                             pattern_info = f"✓ 已加入用户指定的规律: {specific_pattern_name}"
-                            print(pattern_info)
+                            logger.info("%s", pattern_info)
                         else:
-                            print(f"未找到指定的规律: {specific_pattern_name}，将使用最新规律")
+                            logger.warning("未找到指定的规律: %s，将使用最新规律", specific_pattern_name)
                             specific_pattern_name = None
                     
                     # 如果没有指定规律或未找到，使用最新规律
@@ -222,20 +269,20 @@ class StockLLMAnalyzer:
 
 请参考以上用户总结的规律，结合当前股票数据进行对比分析。"""
                                 pattern_info = f"✓ 已加入用户总结的规律: {pattern_name} (共{pattern_count}条规律)"
-                                print(pattern_info)
+                                logger.info("%s", pattern_info)
                                 if pattern_count > 1:
-                                    print(f"  可用规律列表: {', '.join(pattern_list[:5])}{'...' if len(pattern_list) > 5 else ''}")
+                                    logger.info("  可用规律列表: %s%s", ', '.join(pattern_list[:5]), '...' if len(pattern_list) > 5 else '')
                             else:
                                 # 虽然summary存在，但没有找到pattern_summary_few_shot类型的策略
-                                print("未找到用户总结的规律")
+                                logger.warning("未找到用户总结的规律")
                                 pattern_summary = ""
                                 pattern_info = ""
                         else:
-                            print("未找到用户总结的规律")
+                            logger.warning("未找到用户总结的规律")
                             pattern_summary = ""
                             pattern_info = ""
                 except Exception as e:
-                    print(f"获取规律总结失败: {e}")
+                    logger.error("获取规律总结失败: %s", e)
             
             # 构建完整提示词
             prompt = f"""{base_prompt}
@@ -246,7 +293,7 @@ class StockLLMAnalyzer:
 分析时间: {stock_data.get('analysis_date', '未知')}
 
 【股票关键数据】
-{json.dumps(stock_data.get('key_metrics', {}), ensure_ascii=False, indent=2)}
+{_json_text(stock_data.get('key_metrics', {}))}
 
 【历史数据摘要】
 {stock_data.get('history_summary', '无数据')}
@@ -254,62 +301,69 @@ class StockLLMAnalyzer:
 
 请提供详细的分析，特别注意参考用户总结的规律（如果提供了的话）。"""
             
+            # 提示词预览（显示和返回结果共用，结果中不保留完整提示词）
+            prompt_preview = prompt if len(prompt) <= 500 else f"{prompt[:500]}..."
+            
             # 3. 显示完整提示词和输入数据（调试）
-            print(f"\n{'='*60}")
-            print(f"【发送给大模型的完整提示词】")
-            print(f"{'='*60}")
-            print(f"提示词长度: {len(prompt)} 字符")
-            print(f"\n【股票数据摘要】")
-            print(f"股票代码: {stock_data.get('symbol', symbol)}")
-            print(f"股票名称: {stock_data.get('name', '未知')}")
-            print(f"分析日期: {stock_data.get('analysis_date', '未知')}")
-            
-            print(f"\n【关键指标】")
+            logger.info("\n%s", _SEPARATOR)
+            logger.info("【发送给大模型的完整提示词】")
+            logger.info("%s", _SEPARATOR)
+            logger.info("提示词长度: %s 字符", len(prompt))
+            logger.info("\n【股票数据摘要】")
+            logger.info("股票代码: %s", stock_data.get('symbol', symbol))
+            logger.info("股票名称: %s", stock_data.get('name', '未知'))
+            logger.info("分析日期: %s", stock_data.get('analysis_date', '未知'))
+            
+            logger.info("\n【关键指标】")
             key_metrics = stock_data.get('key_metrics', {})
             for key, value in key_metrics.items():
-                print(f"  {key}: {value}")
+                logger.info("  %s: %s", key, value)
             
-            print(f"\n【历史数据摘要】")
-            print(stock_data.get('history_summary', '无数据'))
+            logger.info("\n【历史数据摘要】")
+            logger.info("%s", stock_data.get('history_summary', '无数据'))
             
             if pattern_summary:
-                print(f"\n【使用的量化规律】")
+                logger.info("\n【使用的量化规律】")
                 # 显示规律的前200个字符
                 pattern_preview = pattern_summary[:200] + "..." if len(pattern_summary) > 200 else pattern_summary
-                print(pattern_preview)
+                logger.info("%s", pattern_preview)
             else:
-                print(f"\n【使用的量化规律】: 无")
+                logger.info("\n【使用的量化规律】: 无")
             
-            print(f"\n【提示词预览（前500字符）】")
-            print(prompt[:500] + "..." if len(prompt) > 500 else prompt)
-            print(f"{'='*60}\n")
+            logger.info("\n【提示词预览（前500字符）】")
+            logger.info("%s", prompt_preview)
+            logger.info("%s\n", _SEPARATOR)
             
             # 4. 智能分析功能
-            print(f"【大模型分析】正在调用 {self.llm_provider} API 进行智能分析...")
+            logger.info("【大模型分析】正在调用 %s API 进行智能分析...", self.llm_provider)
             if not self.llm_core:
                 return {"error": "LLM核心模块未初始化"}
             
-            # 调用LLM API，不使用本地模拟
-            llm_response = self.llm_core.call_llm(prompt, use_local=False)
+            # 调用LLM API，不使用本地模拟；要求按JSON返回各章节，解析更可靠
+            raw_response = self.llm_core.call_llm(prompt, use_local=False, json_mode=True)
             
             # 5. 解析结果
-            analysis_result = self.llm_core.parse_llm_response(llm_response)
+            analysis_result = self.llm_core.parse_llm_response(raw_response)
             
             # 如果解析结果为空，显示原始响应
             if not any(analysis_result.values()):
-                print(f"【警告】解析LLM响应失败，将显示原始响应")
-                analysis_result = {"原始响应": llm_response}
+                logger.warning("【警告】解析LLM响应失败，将显示原始响应")
+                analysis_result = {"原始响应": raw_response}
+                llm_response = raw_response
+            else:
+                # 原始响应是JSON文本，还原为【章节】文本后再用于显示、保存经验和优化提示词
+                llm_response = self.llm_core.format_llm_sections(analysis_result)
             
             # 5. 更新提示词库
             if update_prompt and prompt_manager:
-                print(f"【提示词优化】将本次分析用于优化提示词库...")
+                logger.info("【提示词优化】将本次分析用于优化提示词库...")
                 update_prompt_from_case(symbol, stock_data, llm_response)
-                print("✓ 提示词库已更新")
+                logger.info("✓ 提示词库已更新")
             
             # 6. 合并结果
             result = {
                 **stock_data,
-                "llm_prompt": prompt[:500] + "..." if len(prompt) > 500 else prompt,
+                "llm_prompt": prompt_preview,
                 "llm_response": llm_response,
                 "analysis": analysis_result,
                 "analysis_type": "enhanced" if prompt_manager else "basic",
@@ -319,14 +373,137 @@ class StockLLMAnalyzer:
             return result
             
         except Exception as e:
-            print(f"LLM分析失败: {e}")
+            logger.error("LLM分析失败: %s", e)
             return {"error": f"LLM分析失败: {str(e)}"}
+        finally:
+            # 返回前输出完所有日志，避免与调用方随后的输出交错
+            flush_logs()
+    
+    def analyze_many(self, symbols: List[str], max_workers: int = 16, rpm: int = None,
+                     include_pattern_summary: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        并发分析多只股票（每只股票一次LLM调用）
+        
+        共享的OpenAI客户端是线程安全的，各股票的请求可以同时进行
+        
+        Args:
+            symbols: 股票代码列表
+            max_workers: 最大并发数
+            rpm: 提供商每分钟请求数限制，提供时并发数不超过rpm/60
+            include_pattern_summary: 是否加入用户总结的规律
+            
+        Returns:
+            {股票代码: 分析结果}
+        """
+        if not symbols:
+            return {}
+        
+        workers = min(max_workers, len(symbols))
+        if rpm:
+            workers = min(workers, max(1, rpm // 60))
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                str(symbol).zfill(6): executor.submit(
+                    self.analyze_with_llm, symbol, include_pattern_summary=include_pattern_summary
+                )
+                for symbol in symbols
+            }
+            return {symbol: future.result() for symbol, future in futures.items()}
+    
+    def analyze_batch(self, symbols: List[str], batch_size: int = 8) -> Dict[str, Dict[str, Any]]:
+        """
+        批量分析多只股票，每batch_size只股票合并为一次LLM调用
+        
+        合并后分析规则只发送一次，网络往返和排队开销按批次而不是按股票计算。
+        批量响应无法解析或缺少某只股票时，该股票回退为单独调用analyze_with_llm。
+        
+        Args:
+            symbols: 股票代码列表
+            batch_size: 每次调用包含的股票数量（建议4-16）
+            
+        Returns:
+            {股票代码: 分析结果}
+        """
+        results = {}
+        if not self.llm_core:
+            return {str(s).zfill(6): {"error": "LLM核心模块未初始化"} for s in symbols}
+        
+        batch_size = max(1, batch_size)
+        for start in range(0, len(symbols), batch_size):
+            chunk = symbols[start:start + batch_size]
+            
+            # 1. 收集本批次的股票数据
+            stock_data_map = {}
+            for symbol in chunk:
+                stock_data = self.collect_stock_data(symbol)
+                symbol_clean = str(symbol).zfill(6)
+                if "error" in stock_data:
+                    results[symbol_clean] = {"error": stock_data["error"]}
+                else:
+                    stock_data_map[symbol_clean] = stock_data
+            
+            if not stock_data_map:
+                continue
+            
+            # 2. 一次调用分析整个批次
+            logger.info("【批量分析】正在分析 %s 只股票: %s", len(stock_data_map), ', '.join(stock_data_map))
+            parsed = []
+            try:
+                prompt = self._build_batch_prompt(list(stock_data_map.values()))
+                llm_response = self.llm_core.call_llm(prompt, use_local=False)
+                parsed = self.llm_core.parse_llm_response_batch(llm_response)
+            except Exception as e:
+                logger.error("批量分析失败: %s", e)
+            
+            # 3. 按股票代码分发结果，未按代码返回时按顺序对应
+            keys = list(stock_data_map)
+            for i, item in enumerate(parsed):
+                symbol_clean = item["symbol"] if item["symbol"] in stock_data_map else (keys[i] if i < len(keys) else "")
+                if not symbol_clean or symbol_clean in results or not any(item["sections"].values()):
+                    continue
+                results[symbol_clean] = {
+                    **stock_data_map[symbol_clean],
+                    "llm_response": self.llm_core.format_llm_sections(item["sections"]),
+                    "analysis": item["sections"],
+                    "analysis_type": "batch",
+                    "pattern_info": ""
+                }
+            
+            # 4. 批量结果缺失的股票单独分析
+            for symbol_clean in keys:
+                if symbol_clean not in results:
+                    logger.info("批量结果缺少 %s，单独分析", symbol_clean)
+                    results[symbol_clean] = self.analyze_with_llm(symbol_clean, include_pattern_summary=False)
+        
+        return results
+    
+    def _build_batch_prompt(self, stock_data_list: List[Dict[str, Any]]) -> str:
+        """构建多只股票合并分析的提示词"""
+        parts = [
+            "你是一个资深的股票分析师，擅长分析连板股票走势。请分别分析以下每只股票。\n",
+            self.experience_prompts["specific_rules"]
+        ]
+        for i, stock_data in enumerate(stock_data_list, 1):
+            key_metrics = stock_data.get("key_metrics", {})
+            parts.append(f"""
+=== STOCK {i} ===
+股票代码: {stock_data.get('symbol', '')}
+股票名称: {stock_data.get('name', '未知')}
+分析日期: {stock_data.get('analysis_date', '未知')}
+【关键指标】
+{chr(10).join(f"{k}: {v}" for k, v in key_metrics.items())}
+【历史数据】
+{stock_data.get('history_summary', '无数据')}
+""")
+        parts.append(f"""
+请只返回一个长度为{len(stock_data_list)}的JSON数组，按上面的顺序每只股票一个对象，不要输出其他内容。
+每个对象的字段为：symbol（股票代码）、综合结论、详细分析、明日预期、操作建议、风险提示，字段值均为字符串。
+""")
+        return "".join(parts)
     
     def _build_llm_prompt(self, stock_data: Dict[str, Any]) -> str:
         """构建LLM提示词"""
-        basic_template = self.experience_prompts["basic_template"]
-        specific_rules = self.experience_prompts["specific_rules"]
-        
         # 准备数据
         symbol = stock_data.get("symbol", "")
         name = stock_data.get("name", symbol)
@@ -334,22 +511,30 @@ class StockLLMAnalyzer:
         history_summary = stock_data.get("history_summary", "")
         key_metrics = stock_data.get("key_metrics", {})
         
-        # 格式化关键指标
-        key_metrics_str = "\n".join([f"{k}: {v}" for k, v in key_metrics.items()])
-        
-        # 填充模板
-        prompt = basic_template.format(
-            symbol=symbol,
-            name=name,
-            analysis_date=analysis_date,
-            history_summary=history_summary,
-            key_metrics=key_metrics_str
-        )
+        # 格式化关键指标（逐段追加后一次性join，不生成中间的f-string）
+        km_parts = []
+        for k, v in key_metrics.items():
+            km_parts.append(k)
+            km_parts.append(": ")
+            km_parts.append(str(v))
+            km_parts.append("\n")
+        key_metrics_str = "".join(km_parts).rstrip("\n")
         
-        # 添加具体规则
-        prompt += specific_rules
+        values = {
+            "symbol": symbol,
+            "name": name,
+            "analysis_date": analysis_date,
+            "history_summary": history_summary,
+            "key_metrics": key_metrics_str
+        }
         
-        return prompt
+        # 按预解析的片段填充模板（已包含具体规则）
+        parts = []
+        for literal, field_name in self._template_segments:
+            parts.append(literal)
+            if field_name is not None:
+                parts.append(str(values[field_name]))
+        return "".join(parts)
     
     def generate_quant_strategy(self, stock_symbol: str, user_input: str, 
                                days_back: int = 5) -> Dict[str, Any]:
@@ -366,29 +551,31 @@ class StockLLMAnalyzer:
         """
         try:
             # 1. 收集股票数据
-            print(f"【量化策略】收集股票 {stock_symbol} 的数据...")
+            logger.info("【量化策略】收集股票 %s 的数据...", stock_symbol)
             stock_data = self.collect_stock_data(stock_symbol, days_back)
             
             if "error" in stock_data:
                 return {"error": stock_data["error"]}
             
             # 2. 构建量化策略提示词
-            print(f"【量化策略】构建提示词...")
+            logger.info("【量化策略】构建提示词...")
             if not self.llm_core:
                 return {"error": "LLM核心模块未初始化"}
             
             prompt = self.llm_core.generate_quant_strategy_prompt(stock_data, user_input)
             
             # 3. 调用LLM生成策略
-            print(f"【量化策略】调用LLM生成策略...")
-            # 调用LLM API，不使用本地模拟
-            llm_response = self.llm_core.call_llm(prompt, use_local=False)
+            logger.info("【量化策略】调用LLM生成策略...")
+            # 调用LLM API，不使用本地模拟；同一交易日相同股票和需求的策略直接复用缓存
+            cache_key = self.llm_core.quant_strategy_cache_key(stock_data, user_input)
+            llm_response = self.llm_core.call_llm(prompt, use_local=False, cache_key=cache_key)
             
             # 4. 创建策略对象
+            now = datetime.now()
             strategy = {
-                "name": f"量化策略-{stock_symbol}-{datetime.now().strftime('%Y%m%d-%H%M')}",
+                "name": f"量化策略-{stock_symbol}-{now.strftime('%Y%m%d-%H%M')}",
                 "description": f"基于股票{stock_symbol}数据和用户需求生成的量化策略",
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "created_at": now.strftime("%Y-%m-%d %H:%M:%S"),
                 "content": llm_response,
                 "stock_symbol": stock_symbol,
                 "user_input": user_input,
@@ -406,7 +593,7 @@ class StockLLMAnalyzer:
             return strategy
             
         except Exception as e:
-            print(f"生成量化策略失败: {e}")
+            logger.error("生成量化策略失败: %s", e)
             return {
                 "name": "基础策略",
                 "description": "生成失败时的默认策略",
@@ -415,55 +602,53 @@ class StockLLMAnalyzer:
                 "user_input": user_input,
                 "source": "error_fallback"
             }
+        finally:
+            flush_logs()
     
     def _save_quant_strategy(self, strategy: Dict[str, Any]):
         """保存量化策略到本地文件"""
         try:
-            strategy_dir = "quant_strategies"
-            if not os.path.exists(strategy_dir):
-                os.makedirs(strategy_dir)
-            
-            filename = f"{strategy_dir}/strategy_{strategy['name']}.json"
+            filename = self._strategy_dir / f"strategy_{strategy['name']}.json"
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(strategy, f, ensure_ascii=False, indent=2)
+            _write_json_file(filename, strategy)
             
-            print(f"量化策略已保存到: {filename}")
+            logger.info("量化策略已保存到: %s", filename)
             
         except Exception as e:
-            print(f"保存量化策略失败: {e}")
+            logger.error("保存量化策略失败: %s", e)
     
     def save_experience(self, symbol: str, analysis: str, tags: List[str] = None):
         """
         保存分析经验到本地文件
         """
         try:
-            experience_dir = "stock_experiences"
-            if not os.path.exists(experience_dir):
-                os.makedirs(experience_dir)
-            
-            filename = f"{experience_dir}/experience_{symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            now = datetime.now()
+            filename = self._experience_dir / f"experience_{symbol}_{now.strftime('%Y%m%d_%H%M%S')}.json"
             
             experience_data = {
                 "symbol": symbol,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "analysis": analysis,
                 "tags": tags or [],
                 "source": "llm_analysis"
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(experience_data, f, ensure_ascii=False, indent=2)
+            _write_json_file(filename, experience_data)
             
-            print(f"经验已保存到: {filename}")
+            logger.info("经验已保存到: %s", filename)
             
         except Exception as e:
-            print(f"保存经验失败: {e}")
+            logger.error("保存经验失败: %s", e)
 
 
 # 创建全局实例
 def create_llm_analyzer():
-    """创建LLM分析器实例"""
+    """
+    创建LLM分析器实例
+    
+    Raises:
+        RuntimeError: 未设置API密钥或提供商不受支持
+    """
     
     # 从环境变量获取配置
     llm_provider = os.environ.get("LLM_PROVIDER", "deepseek").lower()
@@ -472,12 +657,12 @@ def create_llm_analyzer():
     if llm_provider == "deepseek":
         api_key = os.environ.get("DEEPSEEK_API_KEY")
         if not api_key:
-            print("错误: 未设置DeepSeek API密钥")
-            print("请设置环境变量 DEEPSEEK_API_KEY")
-            print("例如: export DEEPSEEK_API_KEY='your-api-key-here'")
-            sys.exit(1)
+            logger.error("错误: 未设置DeepSeek API密钥")
+            logger.error("请设置环境变量 DEEPSEEK_API_KEY")
+            logger.error("例如: export DEEPSEEK_API_KEY='your-api-key-here'")
+            raise RuntimeError("未设置DeepSeek API密钥")
         base_url = os.environ.get("LLM_BASE_URL") or "https://api.deepseek.com"
-        print(f"使用DeepSeek作为LLM提供商")
+        logger.info("使用DeepSeek作为LLM提供商")
         return StockLLMAnalyzer(
             llm_provider="deepseek",
             api_key=api_key,
@@ -486,12 +671,12 @@ def create_llm_analyzer():
     elif llm_provider == "openai":
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
-            print("错误: 未设置OpenAI API密钥")
-            print("请设置环境变量 OPENAI_API_KEY")
-            print("例如: export OPENAI_API_KEY='your-api-key-here'")
-            sys.exit(1)
+            logger.error("错误: 未设置OpenAI API密钥")
+            logger.error("请设置环境变量 OPENAI_API_KEY")
+            logger.error("例如: export OPENAI_API_KEY='your-api-key-here'")
+            raise RuntimeError("未设置OpenAI API密钥")
         base_url = os.environ.get("LLM_BASE_URL") or "https://api.openai.com/v1"
-        print(f"使用OpenAI作为LLM提供商")
+        logger.info("使用OpenAI作为LLM提供商")
         return StockLLMAnalyzer(
             llm_provider="openai",
             api_key=api_key,
@@ -500,43 +685,61 @@ def create_llm_analyzer():
     elif llm_provider == "siliconflow":
         api_key = os.environ.get("SILICONFLOW_API_KEY")
         if not api_key:
-            print("错误: 未设置硅基流动API密钥")
-            print("请设置环境变量 SILICONFLOW_API_KEY")
-            print("例如: export SILICONFLOW_API_KEY='your-api-key-here'")
-            sys.exit(1)
+            logger.error("错误: 未设置硅基流动API密钥")
+            logger.error("请设置环境变量 SILICONFLOW_API_KEY")
+            logger.error("例如: export SILICONFLOW_API_KEY='your-api-key-here'")
+            raise RuntimeError("未设置硅基流动API密钥")
         base_url = os.environ.get("LLM_BASE_URL") or "https://api.siliconflow.cn/v1"
-        print(f"使用硅基流动作为LLM提供商")
+        logger.info("使用硅基流动作为LLM提供商")
         return StockLLMAnalyzer(
             llm_provider="siliconflow",
             api_key=api_key,
             base_url=base_url
         )
     else:
-        print(f"错误: 不支持的LLM提供商: {llm_provider}")
-        print("支持的提供商: deepseek, openai, siliconflow")
-        sys.exit(1)
+        logger.error("错误: 不支持的LLM提供商: %s", llm_provider)
+        logger.error("支持的提供商: deepseek, openai, siliconflow")
+        raise RuntimeError(f"不支持的LLM提供商: {llm_provider}")
 
-llm_analyzer = create_llm_analyzer()
+@lru_cache(maxsize=1)
+def get_llm_analyzer() -> StockLLMAnalyzer:
+    """
+    获取全局LLM分析器实例（首次使用时创建）
+    
+    导入本模块不会创建客户端或检查API密钥；创建失败时不缓存，下次调用会重试
+    """
+    return create_llm_analyzer()
+
+def __getattr__(name: str):
+    """兼容旧代码对模块属性llm_analyzer的访问"""
+    if name == "llm_analyzer":
+        return get_llm_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def analyze_stock_with_llm(symbol: str, use_local: bool = False, include_pattern_summary: bool = True) -> Dict[str, Any]:
     """使用LLM分析股票的快捷函数"""
     # 忽略use_local参数，始终使用API
-    return llm_analyzer.analyze_with_llm(symbol, use_local=False, include_pattern_summary=include_pattern_summary)
+    return get_llm_analyzer().analyze_with_llm(symbol, use_local=False, include_pattern_summary=include_pattern_summary)
 
 def collect_stock_data(symbol: str) -> Dict[str, Any]:
     """收集股票数据的快捷函数"""
-    return llm_analyzer.collect_stock_data(symbol)
+    return get_llm_analyzer().collect_stock_data(symbol)
 
 def generate_quant_strategy(stock_symbol: str, user_input: str) -> Dict[str, Any]:
     """生成量化策略的快捷函数"""
-    return llm_analyzer.generate_quant_strategy(stock_symbol, user_input)
+    return get_llm_analyzer().generate_quant_strategy(stock_symbol, user_input)
 
 if __name__ == "__main__":
     # 测试代码
+    setup_logging()
     print("股票LLM分析器测试")
     print("=" * 60)
     
     # 显示配置信息
+    try:
+        llm_analyzer = get_llm_analyzer()
+    except RuntimeError:
+        sys.exit(1)
     print("\n当前LLM配置:")
     print(f"提供商: {llm_analyzer.llm_provider}")
     
@@ -5,14 +5,359 @@
 """
 
 import os
+import re
 import json
-from typing import Dict, List, Any, Optional
+import time
+import random
+import hashlib
+import threading
+from contextlib import contextmanager
+from string import Template
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+from stock_log import get_logger
+
+logger = get_logger("llm_core")
+
+# 尝试使用orjson加速JSON读写，未安装时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_text(data: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """
+    序列化为JSON文本（用于拼入提示词和计算缓存键，优先使用orjson）
+    
+    中文原样输出，无法直接序列化的对象（如日期）转为字符串
+    """
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=str, option=option).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None,
+                      sort_keys=sort_keys, default=str)
+
+
+# 共享的OpenAI SDK客户端缓存，按(api_key, base_url)区分
+# 同一配置在进程内只创建一个客户端，底层httpx连接池保持长连接，避免每次调用重新握手
+_shared_clients: Dict[Tuple[Optional[str], Optional[str]], Any] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _get_shared_client(api_key: Optional[str], base_url: Optional[str] = None):
+    """
+    获取（必要时创建）共享的OpenAI客户端
+    
+    Args:
+        api_key: API密钥
+        base_url: API基础URL，为None时使用SDK默认地址
+        
+    Returns:
+        OpenAI客户端实例
+    """
+    key = (api_key, base_url)
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            from openai import OpenAI
+            import httpx
+            http_client = httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=90),
+                timeout=httpx.Timeout(120.0, connect=10.0)
+            )
+            client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+            _shared_clients[key] = client
+        return client
+
+# LLM响应缓存：内存层（最近使用的512条）+ 磁盘层（llm_cache目录），24小时有效
+LLM_CACHE_DIR = "llm_cache"
+LLM_CACHE_TTL = 24 * 3600
+_LLM_MEMORY_CACHE_SIZE = 512
+_llm_memory_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+_llm_memory_cache_lock = threading.Lock()
+
+
+# 缓存键计算时用于归一化空白字符
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 调用失败时的最大重试次数
+LLM_MAX_RETRIES = 5
+
+# 单次请求的最大输出token数
+LLM_MAX_TOKENS = 2000
+
+
+class _RateLimiter:
+    """
+    LLM请求限流器
+    
+    同时限制并发请求数、每分钟请求数和每分钟token数（均为60秒滑动窗口），
+    避免并发调用时触发提供商的429限流
+    """
+    
+    def __init__(self, rpm: int = 0, max_concurrency: int = 16, tpm: int = 0):
+        """
+        Args:
+            rpm: 每分钟最大请求数，0表示不限制
+            max_concurrency: 最大并发请求数
+            tpm: 每分钟最大token数（按估算值计），0表示不限制
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._semaphore = threading.BoundedSemaphore(max(1, max_concurrency))
+        # 窗口内的请求：(发出时间, 估算token数)
+        self._window = deque()
+        self._window_tokens = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: int = 0):
+        """等待直到可以发出一个估算消耗tokens个token的请求"""
+        self._semaphore.acquire()
+        try:
+            self._wait_for_window(tokens)
+        except BaseException:
+            self._semaphore.release()
+            raise
+    
+    def release(self):
+        self._semaphore.release()
+    
+    @contextmanager
+    def limit(self, tokens: int = 0):
+        """限流上下文，tokens为本次请求的估算token数"""
+        self.acquire(tokens)
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def _wait_for_window(self, tokens: int):
+        if self.rpm <= 0 and self.tpm <= 0:
+            return
+        # 单个请求超过整个配额时按配额计，否则永远无法发出
+        tokens = min(tokens, self.tpm) if self.tpm > 0 else 0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._window and now - self._window[0][0] >= 60:
+                    self._window_tokens -= self._window.popleft()[1]
+                rpm_ok = self.rpm <= 0 or len(self._window) < self.rpm
+                tpm_ok = self.tpm <= 0 or self._window_tokens + tokens <= self.tpm
+                if rpm_ok and tpm_ok:
+                    self._window.append((now, tokens))
+                    self._window_tokens += tokens
+                    return
+                wait = 60 - (now - self._window[0][0])
+            time.sleep(wait)
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+def _estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """
+    估算一次请求消耗的token数（用于TPM限流）
+    
+    中文大约每个字符一个token，按字符数估算输入部分偏保守，再加上最大输出token数
+    """
+    return sum(len(m["content"]) for m in messages) + max_tokens
+
+
+def _is_retryable_error(e: Exception) -> bool:
+    """判断API错误是否值得重试（限流、服务端错误、网络超时）"""
+    status = getattr(e, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(e).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+# 分析结果的章节名称（顺序即输出顺序）
+_SECTION_NAMES = ("综合结论", "详细分析", "明日预期", "操作建议", "风险提示")
+
+# 章节标题匹配：行首为章节名，或包含【章节名】、章节名：、章节名:
+# 预编译为单个正则，每行只需一次扫描
+_SECTION_ALT = "|".join(_SECTION_NAMES)
+_SECTION_RE = re.compile(rf"^({_SECTION_ALT})|【({_SECTION_ALT})】|({_SECTION_ALT})[：:]")
+_SECTION_ORDER = {name: i for i, name in enumerate(_SECTION_NAMES)}
+
+
+def _match_section(line: str) -> Optional[str]:
+    """
+    行中的章节标题
+    
+    一行中出现多个章节标题时按_SECTION_NAMES的顺序取第一个，而不是取行中最靠前的
+    
+    Returns:
+        章节名；不是章节标题行时返回None
+    """
+    names = [m.group(m.lastindex) for m in _SECTION_RE.finditer(line)]
+    if not names:
+        return None
+    return min(names, key=_SECTION_ORDER.__getitem__)
+
+# JSON输出模式下追加到系统提示词的格式要求
+_JSON_MODE_INSTRUCTION = (
+    '请以严格的JSON对象返回分析结果，不要输出其他内容，格式为：'
+    '{"综合结论": "...", "详细分析": "...", "明日预期": "...", "操作建议": "...", "风险提示": "..."}'
+)
+
+
+# 系统提示词：不含任何随调用变化的内容，每次请求的消息前缀逐字节相同，
+# 服务端（DeepSeek、OpenAI）可自动命中前缀缓存
+_SYSTEM_PROMPT = "你是一个专业的股票分析师，擅长分析中国A股市场，特别是涨停板、连板股、炸板等短线交易模式。请根据提供的数据进行专业分析。"
+_JSON_SYSTEM_PROMPT = f"{_SYSTEM_PROMPT}\n{_JSON_MODE_INSTRUCTION}"
+
+
+def _build_messages(prompt: str, json_mode: bool = False) -> List[Dict[str, str]]:
+    """构建对话消息：固定的系统提示词在前，本次的提示词在后"""
+    return [
+        {"role": "system", "content": _JSON_SYSTEM_PROMPT if json_mode else _SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_json_sections(response: str) -> Optional[Dict[str, str]]:
+    """
+    按JSON格式解析分析结果
+    
+    Returns:
+        章节字典；响应不是包含章节字段的JSON对象时返回None
+    """
+    # 兼容模型用```json代码块包裹输出的情况，只截取最外层的对象
+    start = response.find('{')
+    end = response.rfind('}')
+    if start < 0 or end <= start:
+        return None
+    text = response[start:end + 1]
+    try:
+        data = orjson.loads(text) if orjson else json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not any(name in data for name in _SECTION_NAMES):
+        return None
+    
+    sections = {}
+    for name in _SECTION_NAMES:
+        value = data.get(name, "")
+        if isinstance(value, list):
+            value = "\n".join(str(v) for v in value)
+        elif not isinstance(value, str):
+            value = _json_text(value) if isinstance(value, dict) else str(value)
+        sections[name] = value.strip()
+    return sections
+
+
+class _SectionStreamParser:
+    """
+    增量式章节解析器
+    
+    按行解析LLM响应，可以在流式接收时边收边解析，也可以一次性喂入完整响应
+    """
+    
+    def __init__(self):
+        self.sections = {name: "" for name in _SECTION_NAMES}
+        self._parts = []
+        self._buffer = ""
+        self._current_section = None
+        self._current_content = []
+    
+    def feed(self, text: str):
+        """追加一段文本，处理其中已完整的行"""
+        self._parts.append(text)
+        self._buffer += text
+        if '\n' not in self._buffer:
+            return
+        *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            self._feed_line(line)
+    
+    def _feed_line(self, line: str):
+        line = line.strip()
+        
+        # 检查是否是新的章节
+        section = _match_section(line)
+        if section:
+            if self._current_section:
+                self.sections[self._current_section] = '\n'.join(self._current_content).strip()
+            self._current_section = section
+            self._current_content = []
+            return
+        
+        if self._current_section and line:
+            self._current_content.append(line)
+    
+    def text(self) -> str:
+        """已接收的完整文本"""
+        return "".join(self._parts)
+    
+    def finish(self) -> Dict[str, str]:
+        """处理剩余文本并返回解析结果"""
+        if self._buffer:
+            self._feed_line(self._buffer)
+            self._buffer = ""
+        
+        # 处理最后一个章节
+        if self._current_section:
+            self.sections[self._current_section] = '\n'.join(self._current_content).strip()
+        
+        # 如果所有章节都为空，但响应不为空，将整个响应放入"详细分析"
+        response = self.text()
+        if not any(self.sections.values()) and response:
+            self.sections["详细分析"] = response[:1000]  # 限制长度
+        
+        return self.sections
+
+
 class StockLLMCore:
     """股票LLM核心功能类"""
     
-    def __init__(self, llm_provider: str = "local", api_key: str = None, base_url: str = None):
+    # 量化策略提示词模板（固定的要求在前、每次变化的数据在后，使请求共享尽量长的前缀）
+    _QUANT_PROMPT = Template("""
+你是一个专业的量化策略分析师，专注于中国A股市场的短线交易策略。
+
+请基于下面的股票数据和用户需求，生成一个专业的量化交易策略。
+策略必须具体、可执行、可量化，包含以下部分：
+1. 策略名称
+2. 策略描述
+3. 核心逻辑
+4. 买入条件（具体、可量化）
+5. 卖出条件（止盈、止损、时间止损）
+6. 风险控制（仓位管理、最大回撤）
+7. 适用市场环境
+8. 策略优化建议
+
+请用中文回答，结构清晰。
+
+【股票数据】
+股票代码: $symbol
+股票名称: $name
+分析日期: $analysis_date
+
+【历史数据摘要】
+$history_summary
+
+【关键指标】
+$key_metrics
+
+【用户需求】
+$user_input
+""")
+    
+    def __init__(self, llm_provider: str = "local", api_key: str = None, base_url: str = None,
+                 rpm: int = None, max_concurrency: int = 16, tpm: int = None):
         """
         初始化LLM核心
         
@@ -20,281 +365,503 @@ class StockLLMCore:
             llm_provider: LLM提供商 (deepseek, openai, siliconflow)
             api_key: API密钥
             base_url: API基础URL
+            rpm: 每分钟最大请求数，默认读取环境变量LLM_RPM，未设置时不限制
+            max_concurrency: 最大并发请求数
+            tpm: 每分钟最大token数，默认读取环境变量LLM_TPM，未设置时不限制
         """
         self.llm_provider = llm_provider
         self.api_key = api_key
         self.base_url = base_url
         self.deepseek_client = None
         self.siliconflow_client = None
+        self.openai_client = None
+        # 响应缓存命中统计
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # 流式接收时顺带解析出的章节（按线程保存，供随后的parse_llm_response直接使用）
+        self._stream_local = threading.local()
+        # 请求限流
+        if rpm is None:
+            rpm = int(os.environ.get("LLM_RPM", "0") or 0)
+        if tpm is None:
+            tpm = int(os.environ.get("LLM_TPM", "0") or 0)
+        self._rate_limiter = _RateLimiter(rpm, max_concurrency, tpm)
+        # 正在进行中的请求（相同提示词的并发调用共享同一次API请求）
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
         
-        # 初始化客户端
+        # 初始化客户端（客户端在进程内共享，重复创建StockLLMCore不会新建连接）
         if llm_provider == "deepseek":
             self._init_deepseek_client()
         elif llm_provider == "siliconflow":
             self._init_siliconflow_client()
+        elif llm_provider == "openai":
+            self._init_openai_client()
     
     def _init_deepseek_client(self):
         """初始化DeepSeek客户端"""
         try:
-            from openai import OpenAI
-            self.deepseek_client = OpenAI(
-                api_key=self.api_key or os.environ.get("DEEPSEEK_API_KEY"),
-                base_url=self.base_url or "https://api.deepseek.com"
+            self.deepseek_client = _get_shared_client(
+                self.api_key or os.environ.get("DEEPSEEK_API_KEY"),
+                self.base_url or "https://api.deepseek.com"
             )
-            print("DeepSeek客户端初始化成功")
+            logger.info("DeepSeek客户端初始化成功")
         except ImportError:
-            print("警告: 未安装openai包，DeepSeek功能将不可用")
+            logger.warning("警告: 未安装openai包，DeepSeek功能将不可用")
             self.deepseek_client = None
         except Exception as e:
-            print(f"DeepSeek客户端初始化失败: {e}")
+            logger.error("DeepSeek客户端初始化失败: %s", e)
             self.deepseek_client = None
     
     def _init_siliconflow_client(self):
         """初始化硅基流动客户端"""
         try:
-            from openai import OpenAI
             # 硅基流动的API基础URL
             siliconflow_base_url = self.base_url or "https://api.siliconflow.cn/v1"
-            self.siliconflow_client = OpenAI(
-                api_key=self.api_key or os.environ.get("SILICONFLOW_API_KEY"),
-                base_url=siliconflow_base_url
+            self.siliconflow_client = _get_shared_client(
+                self.api_key or os.environ.get("SILICONFLOW_API_KEY"),
+                siliconflow_base_url
             )
-            print("硅基流动客户端初始化成功")
+            logger.info("硅基流动客户端初始化成功")
         except ImportError:
-            print("警告: 未安装openai包，硅基流动功能将不可用")
+            logger.warning("警告: 未安装openai包，硅基流动功能将不可用")
             self.siliconflow_client = None
         except Exception as e:
-            print(f"硅基流动客户端初始化失败: {e}")
+            logger.error("硅基流动客户端初始化失败: %s", e)
             self.siliconflow_client = None
     
-    def call_llm(self, prompt: str, use_local: bool = False) -> str:
+    def _init_openai_client(self):
+        """初始化OpenAI客户端"""
+        try:
+            self.openai_client = _get_shared_client(
+                self.api_key or os.environ.get("OPENAI_API_KEY"),
+                self.base_url
+            )
+            logger.info("OpenAI客户端初始化成功")
+        except ImportError:
+            logger.warning("警告: 未安装openai包，OpenAI功能将不可用")
+            self.openai_client = None
+        except Exception as e:
+            logger.error("OpenAI客户端初始化失败: %s", e)
+            self.openai_client = None
+    
+    def call_llm(self, prompt: str, use_local: bool = False, use_cache: bool = True,
+                 json_mode: bool = False, cache_key: Optional[str] = None) -> str:
         """
         调用LLM API
         
         Args:
             prompt: 提示词
             use_local: 是否使用本地模拟（已弃用，保留参数以兼容）
+            use_cache: 是否使用响应缓存（相同提供商和提示词24小时内直接返回缓存结果）
+            json_mode: 是否要求模型按JSON对象返回各章节（用于个股分析，parse_llm_response可直接解析）
+            cache_key: 自定义缓存键（如quant_strategy_cache_key的结果），为空时按提示词计算
             
         Returns:
             LLM响应
         """
         if use_local:
-            print("错误: 本地模拟功能已移除，请使用API")
+            logger.error("错误: 本地模拟功能已移除，请使用API")
             raise RuntimeError("本地模拟功能已移除，请设置API密钥")
         
+        if cache_key is not None:
+            key = hashlib.sha256(f"{self.llm_provider}:{'json:' if json_mode else ''}{cache_key}".encode('utf-8')).hexdigest()
+        else:
+            key = self._cache_key(prompt, json_mode)
+        if use_cache:
+            cached = self._get_cached_response(key)
+            if cached is not None:
+                self.cache_hits += 1
+                logger.info("✓ 使用缓存的LLM响应 (命中 %s / 未命中 %s)", self.cache_hits, self.cache_misses)
+                return cached
+            self.cache_misses += 1
+        
+        # 相同提示词已有请求在进行中时，等待其结果而不是重复调用API
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+        if not is_owner:
+            logger.info("相同请求正在进行中，等待其结果...")
+            return future.result()
+        
+        try:
+            response = self._dispatch_llm(prompt, json_mode)
+            if use_cache:
+                self._save_cached_response(key, response)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _dispatch_llm(self, prompt: str, json_mode: bool = False) -> str:
+        """按提供商调用对应的API"""
         if self.llm_provider == "deepseek":
-            return self._call_deepseek_api(prompt)
+            response = self._call_deepseek_api(prompt, json_mode)
         elif self.llm_provider == "openai":
-            return self._call_openai_api(prompt)
+            response = self._call_openai_api(prompt, json_mode)
         elif self.llm_provider == "siliconflow":
-            return self._call_siliconflow_api(prompt)
+            response = self._call_siliconflow_api(prompt, json_mode)
         else:
-            print(f"错误: 不支持的LLM提供商: {self.llm_provider}")
-            print("支持的提供商: deepseek, openai, siliconflow")
+            logger.error("错误: 不支持的LLM提供商: %s", self.llm_provider)
+            logger.error("支持的提供商: deepseek, openai, siliconflow")
             raise ValueError(f"不支持的LLM提供商: {self.llm_provider}")
+        return response
+    
+    def _cache_key(self, prompt: str, json_mode: bool = False) -> str:
+        """
+        计算提示词的缓存键
+        
+        提示词先归一化空白字符（连续空白合并为一个空格），
+        仅缩进、换行不同的提示词视为同一请求；不做语义相似匹配，
+        因为不同股票的提示词结构几乎相同，语义相近不代表可以复用分析结果
+        """
+        normalized = _WHITESPACE_RE.sub(" ", prompt).strip()
+        mode = "json:" if json_mode else ""
+        return hashlib.sha256((self.llm_provider + mode + normalized).encode('utf-8')).hexdigest()
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """从内存或磁盘缓存获取LLM响应，过期返回None"""
+        now = time.time()
+        with _llm_memory_cache_lock:
+            entry = _llm_memory_cache.get(cache_key)
+            if entry is not None:
+                response, ts = entry
+                if now - ts < LLM_CACHE_TTL:
+                    _llm_memory_cache.move_to_end(cache_key)
+                    return response
+                del _llm_memory_cache[cache_key]
+        
+        cache_file = os.path.join(LLM_CACHE_DIR, f"{cache_key}.json")
+        if not os.path.exists(cache_file):
+            return None
+        try:
+            if orjson:
+                with open(cache_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            ts = data.get("ts", 0)
+            if now - ts >= LLM_CACHE_TTL:
+                return None
+            response = data.get("response")
+            if response is not None:
+                self._remember_response(cache_key, response, ts)
+            return response
+        except Exception as e:
+            logger.error("读取LLM缓存失败: %s", e)
+            return None
+    
+    def _save_cached_response(self, cache_key: str, response: str):
+        """保存LLM响应到内存和磁盘缓存"""
+        ts = time.time()
+        self._remember_response(cache_key, response, ts)
+        try:
+            os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+            cache_file = os.path.join(LLM_CACHE_DIR, f"{cache_key}.json")
+            if orjson:
+                with open(cache_file, 'wb') as f:
+                    f.write(orjson.dumps({"response": response, "ts": ts}))
+            else:
+                with open(cache_file, 'w', encoding='utf-8') as f:
+                    json.dump({"response": response, "ts": ts}, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error("保存LLM缓存失败: %s", e)
+    
+    @staticmethod
+    def _remember_response(cache_key: str, response: str, ts: float):
+        """写入内存缓存，超出容量时淘汰最久未使用的条目"""
+        with _llm_memory_cache_lock:
+            _llm_memory_cache[cache_key] = (response, ts)
+            _llm_memory_cache.move_to_end(cache_key)
+            while len(_llm_memory_cache) > _LLM_MEMORY_CACHE_SIZE:
+                _llm_memory_cache.popitem(last=False)
     
     def _call_local_llm(self, prompt: str) -> str:
         """
         本地模拟LLM调用（已弃用）
         """
-        print("错误: 本地模拟功能已移除")
-        print("请设置API密钥以使用LLM功能")
+        logger.error("错误: 本地模拟功能已移除")
+        logger.error("请设置API密钥以使用LLM功能")
         raise RuntimeError("本地模拟功能已移除，请使用API调用")
     
     def _generate_quant_strategy(self, prompt: str) -> str:
         """
         生成量化策略（已弃用，仅用于兼容）
         """
-        print("警告: _generate_quant_strategy 方法已弃用，请使用API")
+        logger.warning("警告: _generate_quant_strategy 方法已弃用，请使用API")
         raise RuntimeError("本地模拟功能已移除，请使用API调用")
     
-    def _call_deepseek_api(self, prompt: str) -> str:
+    def _call_deepseek_api(self, prompt: str, json_mode: bool = False) -> str:
         """
         调用DeepSeek API
         """
         if not self.deepseek_client:
-            print("错误: DeepSeek客户端未初始化")
-            print("请检查API密钥设置")
+            logger.error("错误: DeepSeek客户端未初始化")
+            logger.error("请检查API密钥设置")
             raise RuntimeError("DeepSeek客户端未初始化，请检查API密钥")
         
         try:
-            print("正在调用DeepSeek API...")
+            logger.info("正在调用DeepSeek API...")
             
             # 构建消息
-            messages = [
-                {
-                    "role": "system",
-                    "content": "你是一个专业的股票分析师，擅长分析中国A股市场，特别是涨停板、连板股、炸板等短线交易模式。请根据提供的数据进行专业分析。"
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ]
+            messages = _build_messages(prompt, json_mode)
             
-            # 调用API
-            response = self.deepseek_client.chat.completions.create(
-                model="deepseek-chat",
-                messages=messages,
-                max_tokens=2000,
-                temperature=0.7,
-                stream=False
+            # 调用API（流式接收，边接收边解析章节）
+            content = self._stream_completion(
+                self.deepseek_client, "deepseek-chat", messages,
+                json_mode=json_mode, response_format=json_mode
             )
             
-            # 提取回复内容
-            if response and response.choices:
-                content = response.choices[0].message.content
-                print("DeepSeek API调用成功")
+            if content:
+                logger.info("DeepSeek API调用成功")
                 return content
             else:
-                print("错误: DeepSeek API返回空响应")
+                logger.error("错误: DeepSeek API返回空响应")
                 raise RuntimeError("DeepSeek API返回空响应")
                 
         except Exception as e:
-            print(f"DeepSeek API调用失败: {e}")
-            print("错误: API调用失败，请检查网络连接和API密钥")
+            logger.error("DeepSeek API调用失败: %s", e)
+            logger.error("错误: API调用失败，请检查网络连接和API密钥")
             raise RuntimeError(f"DeepSeek API调用失败: {e}")
     
-    def _call_openai_api(self, prompt: str) -> str:
+    def _call_openai_api(self, prompt: str, json_mode: bool = False) -> str:
         """
         调用OpenAI API
         """
+        if not self.openai_client:
+            logger.error("错误: OpenAI客户端未初始化")
+            logger.error("请检查API密钥设置")
+            raise RuntimeError("OpenAI客户端未初始化，请检查API密钥")
+        
         try:
-            from openai import OpenAI
-            
-            client = OpenAI(api_key=self.api_key or os.environ.get("OPENAI_API_KEY"))
+            logger.info("正在调用OpenAI API...")
             
-            print("正在调用OpenAI API...")
+            messages = _build_messages(prompt, json_mode)
             
-            messages = [
-                {
-                    "role": "system",
-                    "content": "你是一个专业的股票分析师，擅长分析中国A股市场，特别是涨停板、连板股、炸板等短线交易模式。请根据提供的数据进行专业分析。"
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ]
-            
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=messages,
-                max_tokens=2000,
-                temperature=0.7,
-                stream=False
+            content = self._stream_completion(
+                self.openai_client, "gpt-3.5-turbo", messages,
+                json_mode=json_mode, response_format=json_mode
             )
             
-            if response and response.choices:
-                content = response.choices[0].message.content
-                print("OpenAI API调用成功")
+            if content:
+                logger.info("OpenAI API调用成功")
                 return content
             else:
-                print("错误: OpenAI API返回空响应")
+                logger.error("错误: OpenAI API返回空响应")
                 raise RuntimeError("OpenAI API返回空响应")
                 
         except Exception as e:
-            print(f"OpenAI API调用失败: {e}")
-            print("错误: API调用失败，请检查网络连接和API密钥")
+            logger.error("OpenAI API调用失败: %s", e)
+            logger.error("错误: API调用失败，请检查网络连接和API密钥")
             raise RuntimeError(f"OpenAI API调用失败: {e}")
     
-    def _call_siliconflow_api(self, prompt: str) -> str:
+    def _call_siliconflow_api(self, prompt: str, json_mode: bool = False) -> str:
         """
         调用硅基流动API
         """
         if not self.siliconflow_client:
-            print("错误: 硅基流动客户端未初始化")
-            print("请检查API密钥设置")
+            logger.error("错误: 硅基流动客户端未初始化")
+            logger.error("请检查API密钥设置")
             raise RuntimeError("硅基流动客户端未初始化，请检查API密钥")
         
         try:
-            print("正在调用硅基流动API...")
+            logger.info("正在调用硅基流动API...")
             
             # 构建消息
-            messages = [
-                {
-                    "role": "system",
-                    "content": "你是一个专业的股票分析师，擅长分析中国A股市场，特别是涨停板、连板股、炸板等短线交易模式。请根据提供的数据进行专业分析。"
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ]
+            messages = _build_messages(prompt, json_mode)
             
             # 调用API，使用硅基流动的模型（例如Qwen2.5-7B-Instruct）
-            response = self.siliconflow_client.chat.completions.create(
-                model="Qwen/Qwen2.5-7B-Instruct",  # 硅基流动上的模型名称
-                messages=messages,
-                max_tokens=2000,
-                temperature=0.7,
-                stream=False
+            content = self._stream_completion(
+                self.siliconflow_client,
+                "Qwen/Qwen2.5-7B-Instruct",  # 硅基流动上的模型名称
+                messages,
+                json_mode=json_mode
             )
             
-            # 提取回复内容
-            if response and response.choices:
-                content = response.choices[0].message.content
-                print("硅基流动API调用成功")
+            if content:
+                logger.info("硅基流动API调用成功")
                 return content
             else:
-                print("错误: 硅基流动API返回空响应")
+                logger.error("错误: 硅基流动API返回空响应")
                 raise RuntimeError("硅基流动API返回空响应")
                 
         except Exception as e:
-            print(f"硅基流动API调用失败: {e}")
-            print("错误: API调用失败，请检查网络连接和API密钥")
+            logger.error("硅基流动API调用失败: %s", e)
+            logger.error("错误: API调用失败，请检查网络连接和API密钥")
             raise RuntimeError(f"硅基流动API调用失败: {e}")
     
+    def _stream_completion(self, client, model: str, messages: List[Dict[str, str]],
+                           json_mode: bool = False, response_format: bool = False) -> str:
+        """
+        以流式方式调用chat completions接口
+        
+        接收的同时按行解析章节，解析结果保存在当前线程中，
+        随后对同一响应调用parse_llm_response时无需再次解析。
+        请求经过限流器，遇到限流或服务端错误时按指数退避重试
+        
+        Args:
+            client: OpenAI客户端
+            model: 模型名称
+            messages: 消息列表
+            json_mode: 是否要求按JSON对象返回各章节
+            response_format: 是否同时传入response_format参数（仅部分提供商支持）
+        
+        Returns:
+            完整的响应文本
+        """
+        tokens = _estimate_tokens(messages, LLM_MAX_TOKENS)
+        attempt = 0
+        while True:
+            parser = _SectionStreamParser()
+            extra = {"response_format": {"type": "json_object"}} if response_format else {}
+            try:
+                with self._rate_limiter.limit(tokens):
+                    stream = client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=LLM_MAX_TOKENS,
+                        temperature=0.7,
+                        stream=True,
+                        **extra
+                    )
+                    for chunk in stream:
+                        if chunk.choices:
+                            delta = chunk.choices[0].delta.content
+                            if delta:
+                                parser.feed(delta)
+                break
+            except Exception as e:
+                if response_format and getattr(e, "status_code", None) == 400:
+                    # 服务端不支持JSON模式时去掉response_format重试，结果由parse_llm_response兜底解析
+                    # （改用普通模式不计入重试次数）
+                    logger.warning("服务端不支持JSON输出模式，改用普通模式")
+                    response_format = False
+                    continue
+                if attempt >= LLM_MAX_RETRIES or not _is_retryable_error(e):
+                    raise
+                # 指数退避加随机抖动，避免并发请求同时重试
+                delay = min(60, 2 ** attempt + random.random())
+                logger.warning("API请求失败（%s），%.1f秒后第%s次重试...", type(e).__name__, delay, attempt + 1)
+                time.sleep(delay)
+                attempt += 1
+        
+        content = parser.text()
+        sections = (_parse_json_sections(content) if json_mode else None) or parser.finish()
+        self._stream_local.parsed = (content, sections)
+        return content
+    
     def parse_llm_response(self, response: str) -> Dict[str, str]:
         """
         解析LLM响应，提取结构化信息
         """
-        sections = {
-            "综合结论": "",
-            "详细分析": "",
-            "明日预期": "",
-            "操作建议": "",
-            "风险提示": ""
-        }
-        
         # 如果响应为空，返回空字典
         if not response:
+            return {name: "" for name in _SECTION_NAMES}
+        
+        # 流式接收时已解析过的响应直接返回
+        parsed = getattr(self._stream_local, "parsed", None)
+        if parsed and parsed[0] == response:
+            return dict(parsed[1])
+        
+        # JSON格式的响应直接解析，否则按章节标题解析
+        sections = _parse_json_sections(response)
+        if sections is not None:
             return sections
         
-        current_section = None
-        current_content = []
+        parser = _SectionStreamParser()
+        parser.feed(response)
+        return parser.finish()
+    
+    @staticmethod
+    def format_llm_sections(sections: Dict[str, str]) -> str:
+        """
+        把解析出的章节还原为【章节名】文本（JSON模式的响应用于显示、保存经验时使用）
         
-        for line in response.split('\n'):
-            line = line.strip()
+        Args:
+            sections: parse_llm_response返回的章节字典
             
-            # 检查是否是新的章节
-            section_found = False
-            for section in sections.keys():
-                # 检查多种可能的格式
-                if (line.startswith(section) or 
-                    f"【{section}】" in line or 
-                    f"{section}：" in line or
-                    f"{section}:" in line):
-                    if current_section:
-                        sections[current_section] = '\n'.join(current_content).strip()
-                    current_section = section
-                    current_content = []
-                    section_found = True
-                    break
+        Returns:
+            按章节顺序排列的文本，跳过内容为空的章节
+        """
+        return '\n\n'.join(f"【{name}】\n{content}" for name, content in sections.items() if content)
+    
+    def parse_llm_response_batch(self, response: str) -> List[Dict[str, Any]]:
+        """
+        解析批量分析的LLM响应（JSON数组，每个元素对应一只股票）
+        
+        Args:
+            response: LLM响应文本
             
-            if not section_found:
-                if current_section and line:
-                    current_content.append(line)
+        Returns:
+            解析结果列表，每项包含symbol和各章节内容；无法解析时返回空列表
+        """
+        if not response:
+            return []
         
-        # 处理最后一个章节
-        if current_section:
-            sections[current_section] = '\n'.join(current_content).strip()
+        # 兼容模型用```json代码块包裹输出的情况，只截取最外层的数组
+        start = response.find('[')
+        end = response.rfind(']')
+        if start < 0 or end <= start:
+            return []
         
-        # 如果所有章节都为空，但响应不为空，将整个响应放入"详细分析"
-        if not any(sections.values()) and response:
-            sections["详细分析"] = response[:1000]  # 限制长度
+        try:
+            text = response[start:end + 1]
+            items = orjson.loads(text) if orjson else json.loads(text)
+        except (ValueError, TypeError) as e:
+            logger.error("批量响应JSON解析失败: %s", e)
+            return []
+        
+        if not isinstance(items, list):
+            return []
         
-        return sections
+        results = []
+        for item in items:
+            if isinstance(item, dict):
+                # 按章节标题还原为文本，复用单只股票的解析逻辑
+                text = '\n'.join(f"【{k}】\n{v}" for k, v in item.items() if k != "symbol")
+                sections = self.parse_llm_response(text)
+                symbol = str(item.get("symbol", "")).strip()
+            else:
+                sections = self.parse_llm_response(str(item))
+                symbol = ""
+            results.append({"symbol": symbol.zfill(6) if symbol else "", "sections": sections})
+        
+        return results
+    
+    @staticmethod
+    def quant_strategy_cache_key(stock_data: Dict[str, Any], user_input: str) -> str:
+        """
+        量化策略的结构化缓存键
+        
+        由股票代码、分析日期、关键指标和用户需求规范化后计算，
+        同一交易日对同一股票提出相同需求时命中缓存，与提示词的排版无关
+        
+        Args:
+            stock_data: 股票数据
+            user_input: 用户输入的分析需求
+            
+        Returns:
+            缓存键
+        """
+        canonical = _json_text(
+            [
+                "quant_strategy",
+                stock_data.get('symbol', ''),
+                stock_data.get('analysis_date', ''),
+                stock_data.get('key_metrics', {}),
+                user_input.strip(),
+            ],
+            sort_keys=True
+        )
+        return hashlib.blake2b(canonical.encode('utf-8'), digest_size=20).hexdigest()
     
     def generate_quant_strategy_prompt(self, stock_data: Dict[str, Any], user_input: str) -> str:
         """
@@ -307,35 +874,13 @@ class StockLLMCore:
         Returns:
             提示词
         """
-        # 构建量化策略提示词
-        prompt = f"""
-你是一个专业的量化策略分析师，专注于中国A股市场的短线交易策略。
-
-【股票数据】
-股票代码: {stock_data.get('symbol', '未知')}
-股票名称: {stock_data.get('name', '未知')}
-分析日期: {stock_data.get('analysis_date', '未知')}
-
-【历史数据摘要】
-{stock_data.get('history_summary', '无数据')}
-
-【关键指标】
-{stock_data.get('key_metrics', {})}
-
-【用户需求】
-{user_input}
-
-请基于以上股票数据和用户需求，生成一个专业的量化交易策略。
-策略必须具体、可执行、可量化，包含以下部分：
-1. 策略名称
-2. 策略描述
-3. 核心逻辑
-4. 买入条件（具体、可量化）
-5. 卖出条件（止盈、止损、时间止损）
-6. 风险控制（仓位管理、最大回撤）
-7. 适用市场环境
-8. 策略优化建议
-
-请用中文回答，结构清晰。
-"""
+        # 构建量化策略提示词（模板预编译，关键指标以JSON格式输出，结果稳定）
+        prompt = self._QUANT_PROMPT.substitute(
+            symbol=stock_data.get('symbol', '未知'),
+            name=stock_data.get('name', '未知'),
+            analysis_date=stock_data.get('analysis_date', '未知'),
+            history_summary=stock_data.get('history_summary', '无数据'),
+            key_metrics=_json_text(stock_data.get('key_metrics', {})),
+            user_input=user_input
+        )
         return prompt
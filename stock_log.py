@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+日志配置 - 统一各模块的日志输出
+
+日志记录只把消息放入队列，由后台线程写到标准输出，
+并发分析时调用线程不会阻塞在终端IO上。
+导入本模块不会修改日志配置，由程序入口（main.py、界面模块）调用setup_logging
+"""
+
+import sys
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# 本项目所有模块日志的上级logger名称
+ROOT_LOGGER_NAME = "stock_analyzer"
+
+_queue = None
+_listener = None
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level: int = logging.INFO):
+    """
+    配置日志输出（重复调用无副作用）
+
+    只配置本项目的logger，不修改根logger，避免第三方库（如httpx）的日志混入
+
+    Args:
+        level: 日志级别
+    """
+    global _queue, _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        _queue = queue.Queue()
+        handler = logging.StreamHandler(sys.stdout)
+        # 保持与原print输出一致，只输出消息本身
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _listener = QueueListener(_queue, handler, respect_handler_level=True)
+
+        _queue_handler = QueueHandler(_queue)
+        base_logger = logging.getLogger(ROOT_LOGGER_NAME)
+        base_logger.addHandler(_queue_handler)
+        base_logger.setLevel(level)
+        base_logger.propagate = False
+
+        _listener.start()
+        atexit.register(_stop_logging)
+
+
+def _stop_logging():
+    """
+    停止后台输出线程（退出时调用）
+
+    同时移除队列handler，之后的日志交还给根logger，不会再进入无人处理的队列
+    """
+    global _queue, _listener, _queue_handler
+    with _setup_lock:
+        if _listener is None:
+            return
+        base_logger = logging.getLogger(ROOT_LOGGER_NAME)
+        base_logger.removeHandler(_queue_handler)
+        base_logger.propagate = True
+        _listener.stop()
+        _queue = _listener = _queue_handler = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    获取模块logger
+
+    Args:
+        name: 模块名称
+
+    Returns:
+        stock_analyzer.<name> logger
+    """
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def flush_logs():
+    """
+    等待队列中的日志全部输出（在交互输出前调用，保证输出顺序）
+
+    未调用setup_logging或后台输出线程已停止时直接返回
+    """
+    q = _queue
+    if q is None:
+        return
+    # 与queue.join相同，但后台线程停止后不再等待（停止后才放入的日志不会有人处理）
+    with q.all_tasks_done:
+        while q.unfinished_tasks and _listener is not None:
+            q.all_tasks_done.wait(0.1)
@@ -59,6 +59,8 @@ def get_board_changes_data() -> pd.DataFrame:
 
 if __name__ == "__main__":
     # 测试代码
+    from stock_log import setup_logging
+    setup_logging()
     print("股票监控模块测试")
     print("=" * 60)
     
@@ -7,21 +7,159 @@
 """
 
 import pandas as pd
+import numpy as np
 import os
-from typing import Dict, List, Any
+import re
+import math
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import product
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
+
+from stock_log import get_logger, flush_logs
+
+# 依赖模块在模块加载时导入一次，导入失败时使用内联实现
+try:
+    from stock_name_resolver import get_stock_code_by_name
+except ImportError:
+    get_stock_code_by_name = None
+
+try:
+    from stock_data_fetcher import get_stock_info
+except ImportError:
+    get_stock_info = None
+
+try:
+    import stock_rating_advisor
+except ImportError:
+    stock_rating_advisor = None
+
+try:
+    from stock_streak_calculator import calculate_streak_info
+except ImportError:
+    calculate_streak_info = None
+
+from stock_limit_pool import get_limit_pool_codes
+
+logger = get_logger("monitor_analysis")
+_SEPARATOR = "=" * 60
+
+# 关键指标中需要汇总到批量结果的字段
+_BATCH_INDICATOR_COLUMNS = ('是否涨停', '是否有炸板', '是否漏单', '是否重新封板', '是否强势股', '炸板次数')
+
+# 批量分析结果表的列（顺序即输出顺序）
+_BATCH_RESULT_COLUMNS = ('股票代码', '股票名称', *_BATCH_INDICATOR_COLUMNS, '综合评级', '投资建议')
+
+def _to_count(value: Any) -> int:
+    """炸板次数转换为整数，非数字（None、文本等）按0处理"""
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text)
+    try:
+        number = float(text)
+    except ValueError:
+        return 0
+    return int(number) if math.isfinite(number) and number >= 0 else 0
+
+# 批量分析结果表中非字符串列的类型和取值转换，其余列为object
+# （子分析结果中的None或非数字文本转换为False/0，不会导致整行丢弃）
+_BATCH_COLUMN_DTYPES = {
+    '是否涨停': (bool, bool),
+    '是否有炸板': (bool, bool),
+    '是否漏单': (bool, bool),
+    '是否重新封板': (bool, bool),
+    '是否强势股': (bool, bool),
+    '炸板次数': (np.int64, _to_count),
+}
+
+
+# 监控模块导入失败时综合分析返回的错误
+_MODULES_UNAVAILABLE = RuntimeError("监控模块导入失败，无法进行综合分析")
+
+# 上海时区（模块加载时创建一次，各实例共用）
+_TZ_SHANGHAI = ZoneInfo('Asia/Shanghai')
+
+# 股票信息中可能包含连板天数的字段（按优先级排列）
+_STREAK_FIELDS = ('连板数', '连续涨停天数', 'streak', '连板天数', '涨停天数', '连板高度')
+
+# 从“3连板”“5天4板”等文本中提取第一个整数
+_FIRST_INT_RE = re.compile(r'(\d+)')
+
+# 单只股票三项子分析共用的线程池（每项子分析一个线程），首次使用时创建，各实例共用
+_SUB_ANALYSIS_WORKERS = 3
+_sub_pool: Optional[ThreadPoolExecutor] = None
+_sub_pool_lock = threading.Lock()
+
+def _get_sub_pool() -> ThreadPoolExecutor:
+    """获取子分析线程池（首次调用时创建）"""
+    global _sub_pool
+    if _sub_pool is None:
+        with _sub_pool_lock:
+            if _sub_pool is None:
+                _sub_pool = ThreadPoolExecutor(max_workers=_SUB_ANALYSIS_WORKERS,
+                                               thread_name_prefix="monitor_analysis")
+    return _sub_pool
+
+def _padded_codes(codes) -> np.ndarray:
+    """代码列转换为6位代码字符串数组（numpy向量化补0，不逐行调用pandas字符串方法）"""
+    return np.char.zfill(np.asarray(codes).astype('U6'), 6)
+
+def _codes_as_set(codes) -> frozenset:
+    """代码列转换为6位代码的frozenset"""
+    return frozenset(_padded_codes(codes).tolist())
+
+# 股票名称解析结果缓存（只缓存解析成功的名称，失败的下次重新解析）
+_resolved_names: Dict[str, str] = {}
+
+def _resolve_name(name: str):
+    """按名称解析股票代码（带缓存）"""
+    code = _resolved_names.get(name)
+    if code is None:
+        code = get_stock_code_by_name(name)
+        if code:
+            _resolved_names[name] = code
+    return code
+
+@lru_cache(maxsize=4096)
+def _pad_code(symbol: Any) -> str:
+    """股票代码补齐为6位（带缓存，批量分析重复出现的代码无需重复转换）"""
+    return str(symbol).zfill(6)
+
+def _flag_index(flags) -> int:
+    """把评级判断条件（按参数顺序，第一个为最高位）编码为查找表下标"""
+    index = 0
+    for flag in flags:
+        index = (index << 1) | bool(flag)
+    return index
 
 class StockMonitorAnalysis:
     """股票综合分析类"""
     
-    def __init__(self):
-        """初始化"""
-        self.tz_shanghai = pytz.timezone('Asia/Shanghai')
-        self.current_time = datetime.now(self.tz_shanghai)
+    # 内联评级/建议查找表，首次使用时生成
+    _inline_decision = None
+    
+    def __init__(self, max_workers: int = 8):
+        """
+        初始化
+        
+        Args:
+            max_workers: 批量分析时同时分析的最大股票数
+        """
+        self.tz_shanghai = _TZ_SHANGHAI
         self.data_update_hour = 16
+        # 查询日期缓存: ((年, 月, 日, 是否过16点), 查询日期)
+        self._query_date_cache = (None, None)
+        # 批量分析时的线程数（线程池在每次批量分析时创建，结束时关闭）
+        self.max_workers = max_workers
         
         # 导入其他模块的类，添加错误处理
+        # 监控模块是否可用（导入失败时为False，综合分析直接返回错误结果）
+        self._modules_ok = True
         try:
             from stock_monitor_changes import StockMonitorChanges
             from stock_monitor_pool import StockMonitorPool
@@ -29,8 +167,8 @@ class StockMonitorAnalysis:
             self.changes_module = StockMonitorChanges()
             self.pool_module = StockMonitorPool()
         except ImportError as e:
-            print(f"导入监控模块失败: {e}")
-            print("尝试从当前目录导入...")
+            logger.error("导入监控模块失败: %s", e)
+            logger.warning("尝试从当前目录导入...")
             # 尝试相对导入
             try:
                 from .stock_monitor_changes import StockMonitorChanges
@@ -38,32 +176,51 @@ class StockMonitorAnalysis:
                 self.changes_module = StockMonitorChanges()
                 self.pool_module = StockMonitorPool()
             except ImportError:
-                print("无法导入必要的监控模块，某些功能可能不可用")
+                logger.error("无法导入必要的监控模块，某些功能可能不可用")
                 # 创建空对象以避免后续错误
                 class DummyModule:
                     def __getattr__(self, name):
                         def dummy_method(*args, **kwargs):
-                            print(f"警告: {name} 方法不可用，因为模块导入失败")
+                            logger.warning("警告: %s 方法不可用，因为模块导入失败", name)
                             return {}
                         return dummy_method
                 self.changes_module = DummyModule()
                 self.pool_module = DummyModule()
+                self._modules_ok = False
+    
+    @property
+    def current_time(self) -> datetime:
+        """当前上海时间（每次读取都是最新时间，长时间运行的进程不会停留在启动时刻）"""
+        return datetime.now(self.tz_shanghai)
+    
+    @property
+    def query_date(self) -> str:
+        """当前查询日期（同get_query_date，结果按日期和16点分界缓存）"""
+        return self.get_query_date()
     
     def get_query_date(self) -> str:
         """
         根据当前时间确定查询日期
         规则: 16点前查前一个交易日，16点后查当天
+        
+        结果只在日期变化或跨过16点时才会改变，按(年, 月, 日, 是否过16点)缓存，
+        批量分析时不必每只股票都重新计算和打印
         """
-        current_hour = self.current_time.hour
+        now = self.current_time
+        after_update = now.hour >= self.data_update_hour
+        key = (now.year, now.month, now.day, after_update)
+        if self._query_date_cache[0] == key:
+            return self._query_date_cache[1]
         
-        if current_hour < self.data_update_hour:
+        if not after_update:
             # 16点前，查询前一个交易日
-            query_date = (self.current_time - timedelta(days=1)).strftime('%Y%m%d')
+            query_date = (now - timedelta(days=1)).strftime('%Y%m%d')
         else:
             # 16点后，查询当天
-            query_date = self.current_time.strftime('%Y%m%d')
+            query_date = now.strftime('%Y%m%d')
         
-        print(f"监控模块查询日期: {query_date}")
+        self._query_date_cache = (key, query_date)
+        logger.info("监控模块查询日期: %s", query_date)
         return query_date
     
     def comprehensive_analysis(self, symbol: str) -> Dict[str, Any]:
@@ -73,246 +230,418 @@ class StockMonitorAnalysis:
         """
         return self.comprehensive_stock_analysis(symbol)
     
-    def comprehensive_stock_analysis(self, symbol: str) -> Dict[str, Any]:
+    def comprehensive_stock_analysis(self, symbol: str, verbose: bool = True,
+                                     compute_streak: bool = True,
+                                     compute_first_limit_up: bool = True) -> Dict[str, Any]:
         """
         综合分析个股：涨停判断 + 异动情况 + 是否炸板 + 是否强势股
+        
+        Args:
+            symbol: 股票代码或名称
+            verbose: 是否输出评级和建议摘要（批量分析时关闭）
+            compute_streak: 是否计算连板天数（关闭时几连板为0）
+            compute_first_limit_up: 是否查找首次涨停时间（关闭时为“未知”）
         """
         try:
-            # 首先尝试解析股票代码
-            import re
-            if re.match(r'^\d{6}$', str(symbol)):
-                symbol_clean = str(symbol).zfill(6)
-            else:
-                # 尝试使用股票名称解析器
-                try:
-                    from stock_name_resolver import get_stock_code_by_name
-                    resolved_code = get_stock_code_by_name(str(symbol))
-                    if resolved_code:
-                        symbol_clean = resolved_code
-                        print(f"解析股票名称 '{symbol}' 得到代码: {symbol_clean}")
-                    else:
-                        symbol_clean = str(symbol).zfill(6)
-                except ImportError:
-                    print("无法导入 stock_name_resolver，将直接使用输入")
-                    symbol_clean = str(symbol).zfill(6)
-            
-            print(f"\n{'='*60}")
-            print(f"开始对 {symbol} (代码: {symbol_clean}) 进行综合分析...")
-            print(f"{'='*60}")
-            
-            # 1. 分析异动情况（涨停判断、炸板、漏单）
-            print(f"1. 分析异动情况...")
-            change_analysis = self.changes_module.analyze_limit_up_changes(symbol_clean)
-            
-            # 2. 检查是否炸板
-            print(f"2. 检查是否炸板...")
-            炸板_check = self.pool_module.check_if_炸板(symbol_clean)
-            
-            # 3. 检查是否强势股
-            print(f"3. 检查是否强势股...")
-            strong_check = self.pool_module.check_if_strong_stock(symbol_clean)
+            return self._analyze_symbol(symbol, verbose, compute_streak=compute_streak,
+                                        compute_first_limit_up=compute_first_limit_up)
+        finally:
+            flush_logs()
+    
+    def _analyze_symbol(self, symbol: str, verbose: bool = True,
+                        pools: Optional[Tuple[str, Dict[str, int], frozenset]] = None,
+                        compute_streak: bool = True, compute_first_limit_up: bool = True,
+                        parallel: bool = True) -> Dict[str, Any]:
+        """
+        综合分析单只股票（不等待日志输出，供批量分析的工作线程使用）
+        
+        Args:
+            symbol: 股票代码或名称
+            verbose: 是否输出评级和建议摘要
+            pools: 批量分析预先获取的(查询日期, 炸板股池{代码: 炸板次数}, 强势股池代码集合)，
+                   提供时直接查表，不再逐只股票查询炸板股池和强势股池
+            compute_streak: 是否计算连板天数
+            compute_first_limit_up: 是否查找首次涨停时间
+            parallel: 三项子分析是否在子分析线程池中同时进行（批量分析已按股票并发，逐项执行）
+        """
+        if not self._modules_ok:
+            return self._build_error_result(symbol, _MODULES_UNAVAILABLE)
+        try:
+            symbol_clean = self._resolve_symbol(symbol)
             
-            # 4. 综合评估
-            is_limit_up = change_analysis.get('是否涨停', False) if isinstance(change_analysis, dict) else False
-            has_open_limit = change_analysis.get('是否有炸板', False) if isinstance(change_analysis, dict) else False
-            has_big_sell = change_analysis.get('是否大笔卖出', False) if isinstance(change_analysis, dict) else False
-            has_re_limit = change_analysis.get('是否重新封板', False) if isinstance(change_analysis, dict) else False
-            is_in_limit_pool = change_analysis.get('是否在涨停板池中', False) if isinstance(change_analysis, dict) else False
-            is_in_炸板_pool = 炸板_check.get('是否在炸板股池', False) if isinstance(炸板_check, dict) else False
-            is_in_strong_pool = strong_check.get('是否在强势股池', False) if isinstance(strong_check, dict) else False
+            # 单只股票分析时输出横幅和分步进度；批量分析时各股票同时进行，只在调试时输出
+            level = logging.INFO if verbose else logging.DEBUG
+            if logger.isEnabledFor(level):
+                logger.log(level, "\n%s", _SEPARATOR)
+                logger.log(level, "开始对 %s (代码: %s) 进行综合分析...", symbol, symbol_clean)
+                logger.log(level, "%s", _SEPARATOR)
             
-            # 最终是否涨停：如果在涨停板池中，或者有涨停且没有炸板，或者有炸板但重新封板
-            final_is_limit_up = is_in_limit_pool or (is_limit_up and not has_open_limit) or (has_open_limit and has_re_limit)
+            # 查询日期只取一次，各子分析和综合评估使用同一日期（批量分析时与预取股池的日期一致）
+            query_date = pools[0] if pools is not None else self.query_date
             
-            # 获取连板天数
-            streak_days = self._get_streak_days(symbol_clean)
+            if pools is not None:
+                # 1. 分析异动情况（涨停判断、炸板、漏单）
+                logger.log(level, "1. 分析异动情况...")
+                change_analysis = self.changes_module.analyze_limit_up_changes(symbol_clean)
+                # 2/3. 炸板股池和强势股池已预先获取，直接查表
+                炸板_check, strong_check = self._check_prefetched_pools(symbol_clean, pools)
+            elif parallel:
+                # 以下三项相互独立，提交到线程池同时进行
+                sub_pool = _get_sub_pool()
+                # 1. 分析异动情况（涨停判断、炸板、漏单）
+                logger.log(level, "1. 分析异动情况...")
+                f_changes = sub_pool.submit(self.changes_module.analyze_limit_up_changes, symbol_clean)
+                
+                # 2. 检查是否炸板
+                logger.log(level, "2. 检查是否炸板...")
+                f_炸板 = sub_pool.submit(self.pool_module.check_if_炸板, symbol_clean, query_date)
+                
+                # 3. 检查是否强势股
+                logger.log(level, "3. 检查是否强势股...")
+                f_strong = sub_pool.submit(self.pool_module.check_if_strong_stock, symbol_clean, query_date)
+                
+                change_analysis, 炸板_check, strong_check = f_changes.result(), f_炸板.result(), f_strong.result()
+            else:
+                change_analysis = self.changes_module.analyze_limit_up_changes(symbol_clean)
+                炸板_check = self.pool_module.check_if_炸板(symbol_clean, query_date)
+                strong_check = self.pool_module.check_if_strong_stock(symbol_clean, query_date)
             
-            # 获取首次涨停时间（尝试从stock_data_fetcher获取）
-            first_limit_up_time = None
+            return self._build_comprehensive_result(symbol_clean, change_analysis, 炸板_check, strong_check,
+                                                    verbose, query_date, compute_streak, compute_first_limit_up)
+        except Exception as e:
+            logger.error("综合分析过程中发生错误: %s", e)
+            return self._build_error_result(symbol, e)
+    
+    def _prefetch_pools(self) -> Optional[Tuple[str, Dict[str, int], frozenset]]:
+        """
+        批量分析前一次性获取查询日期的炸板股池和强势股池
+        
+        Returns:
+            (查询日期, {代码: 炸板次数}, 强势股池代码集合)；获取失败时返回None（退回逐只查询）
+        """
+        query_date = self.query_date
+        try:
+            炸板_df = self.pool_module.get_炸板_stocks(query_date)
+            strong_df = self.pool_module.get_strong_stocks(query_date)
+        except Exception as e:
+            logger.debug("预取炸板股池/强势股池失败: %s", e)
+            return None
+        if not hasattr(炸板_df, 'columns') or not hasattr(strong_df, 'columns'):
+            return None
+        
+        炸板_counts = {}
+        if not 炸板_df.empty and '代码' in 炸板_df.columns:
+            codes = _padded_codes(炸板_df['代码']).tolist()
+            if '炸板次数' in 炸板_df.columns:
+                counts = pd.to_numeric(炸板_df['炸板次数'], errors='coerce').fillna(0).astype(int)
+            else:
+                counts = [0] * len(codes)
+            # 与check_if_炸板一致，同一代码取第一行
+            for code, count in zip(codes, counts):
+                炸板_counts.setdefault(code, int(count))
+        
+        strong_codes = frozenset()
+        if not strong_df.empty and '代码' in strong_df.columns:
+            strong_codes = _codes_as_set(strong_df['代码'])
+        
+        return query_date, 炸板_counts, strong_codes
+    
+    @staticmethod
+    def _check_prefetched_pools(symbol_clean: str, pools: Tuple[str, Dict[str, int], frozenset]):
+        """按预取的股池生成炸板检查和强势股检查结果（只包含综合评估用到的字段）"""
+        query_date, 炸板_counts, strong_codes = pools
+        count = 炸板_counts.get(symbol_clean)
+        炸板_check = {
+            '股票代码': symbol_clean,
+            '查询日期': query_date,
+            '是否在炸板股池': count is not None,
+            '炸板次数': count or 0,
+        }
+        strong_check = {
+            '股票代码': symbol_clean,
+            '查询日期': query_date,
+            '是否在强势股池': symbol_clean in strong_codes,
+        }
+        return 炸板_check, strong_check
+    
+    async def comprehensive_stock_analysis_async(self, symbol: str, verbose: bool = True,
+                                                 compute_streak: bool = True,
+                                                 compute_first_limit_up: bool = True) -> Dict[str, Any]:
+        """综合分析个股（异步版本，在线程中调用comprehensive_stock_analysis，参数相同）"""
+        return await asyncio.to_thread(self.comprehensive_stock_analysis, symbol, verbose,
+                                       compute_streak, compute_first_limit_up)
+    
+    @staticmethod
+    def _normalize_symbol(symbol: Any) -> str:
+        """规范化输入用于去重：去除首尾空白，纯数字代码补齐为6位"""
+        text = str(symbol).strip()
+        return _pad_code(text) if text.isdigit() else text
+    
+    def _resolve_symbol(self, symbol: str) -> str:
+        """将输入（股票代码或名称）解析为6位股票代码"""
+        text = str(symbol)
+        # 纯数字输入一定是代码，不足6位时补0，无需经过名称解析
+        if len(text) <= 6 and text.isascii() and text.isdigit():
+            return _pad_code(text)
+        
+        # 尝试使用股票名称解析器
+        if get_stock_code_by_name is None:
+            logger.warning("无法导入 stock_name_resolver，将直接使用输入")
+            return _pad_code(symbol)
+        
+        resolved_code = _resolve_name(text)
+        if resolved_code:
+            logger.info("解析股票名称 '%s' 得到代码: %s", symbol, resolved_code)
+            return resolved_code
+        return _pad_code(symbol)
+    
+    def _build_comprehensive_result(self, symbol_clean: str, change_analysis: Dict[str, Any],
+                                    炸板_check: Dict[str, Any], strong_check: Dict[str, Any],
+                                    verbose: bool = True, query_date: Optional[str] = None,
+                                    compute_streak: bool = True,
+                                    compute_first_limit_up: bool = True) -> Dict[str, Any]:
+        """
+        根据三项子分析的结果进行综合评估，生成综合分析结果
+        
+        Args:
+            query_date: 子分析使用的查询日期，为空时使用当前查询日期
+            compute_streak: 是否计算连板天数（批量分析的汇总表不包含该列，可关闭）
+            compute_first_limit_up: 是否查找首次涨停时间（同上）
+        """
+        # 4. 综合评估
+        # 子分析失败时可能返回非字典结果，统一按空字典处理，后续直接取值
+        ca = change_analysis if isinstance(change_analysis, dict) else {}
+        zb = 炸板_check if isinstance(炸板_check, dict) else {}
+        sc = strong_check if isinstance(strong_check, dict) else {}
+        
+        is_limit_up = ca.get('是否涨停', False)
+        has_open_limit = ca.get('是否有炸板', False)
+        has_big_sell = ca.get('是否大笔卖出', False)
+        has_re_limit = ca.get('是否重新封板', False)
+        is_in_limit_pool = ca.get('是否在涨停板池中', False)
+        is_in_炸板_pool = zb.get('是否在炸板股池', False)
+        is_in_strong_pool = sc.get('是否在强势股池', False)
+        
+        # 最终是否涨停：如果在涨停板池中，或者有涨停且没有炸板，或者有炸板但重新封板
+        final_is_limit_up = is_in_limit_pool or (is_limit_up and not has_open_limit) or (has_open_limit and has_re_limit)
+        
+        # 本次评估统一使用同一个查询日期
+        query_date = query_date or self.query_date
+        
+        # 获取连板天数（同时得到计算过程中找到的最近涨停日）
+        if compute_streak:
+            streak_days, latest_limit_up_date = self._get_streak_info(symbol_clean, query_date)
+        else:
+            streak_days, latest_limit_up_date = 0, None
+        
+        # 获取首次涨停时间（尝试从stock_data_fetcher获取）
+        first_limit_up_time = None
+        try:
+            stock_info = get_stock_info(symbol_clean) if get_stock_info and compute_first_limit_up else None
+            if stock_info:
+                # 尝试从多个字段获取首次涨停时间
+                for field in ['首次涨停时间', 'first_limit_up_time', '首板时间']:
+                    if field in stock_info:
+                        value = stock_info[field]
+                        if value:
+                            first_limit_up_time = str(value)
+                            break
+        except:
+            pass
+        
+        # 如果无法获取，使用连板计算中已找到的最近涨停日，不必再逐日查询涨停板池
+        if compute_first_limit_up and not first_limit_up_time and latest_limit_up_date:
+            first_limit_up_time = latest_limit_up_date
+        
+        # 仍然没有时尝试计算（使用最近一次涨停的日期）
+        if compute_first_limit_up and not first_limit_up_time and streak_days > 0:
             try:
-                from stock_data_fetcher import get_stock_info
-                stock_info = get_stock_info(symbol_clean)
-                if stock_info:
-                    # 尝试从多个字段获取首次涨停时间
-                    for field in ['首次涨停时间', 'first_limit_up_time', '首板时间']:
-                        if field in stock_info:
-                            value = stock_info[field]
-                            if value:
-                                first_limit_up_time = str(value)
-                                break
+                current_dt = datetime.strptime(query_date, '%Y%m%d')
+                
+                # 向前查找涨停日，多查几天以防非交易日，最多回溯10天
+                for i in range(min(streak_days + 5, 10)):
+                    check_date = current_dt - timedelta(days=i)
+                    if check_date.weekday() >= 5:
+                        # 周末没有涨停板池数据，不必请求
+                        continue
+                    check_date_str = check_date.strftime('%Y%m%d')
+                    try:
+                        codes = self._get_limit_pool_codes(check_date_str)
+                        if codes and symbol_clean in codes:
+                            # 找到涨停日，这是最近的一次
+                            # 首次涨停应该是这个日期减去(streak_days-1)天
+                            # 但为了简单，我们只记录最近涨停日
+                            first_limit_up_time = check_date_str
+                            break
+                    except:
+                        continue
             except:
                 pass
-            
-            # 如果无法获取，尝试计算（使用最近一次涨停的日期）
-            if not first_limit_up_time and streak_days > 0:
-                try:
-                    import akshare as ak
-                    from datetime import datetime, timedelta
-                    current_date = self.get_query_date()
-                    current_dt = datetime.strptime(current_date, '%Y%m%d')
-                    
-                    # 向前查找涨停日
-                    for i in range(streak_days + 5):  # 多查几天以防非交易日
-                        check_date = current_dt - timedelta(days=i)
-                        check_date_str = check_date.strftime('%Y%m%d')
-                        try:
-                            df = ak.stock_zt_pool_em(date=check_date_str)
-                            if df is not None and not df.empty and '代码' in df.columns:
-                                codes = df['代码'].astype(str).str.zfill(6).tolist()
-                                if symbol_clean in codes:
-                                    # 找到涨停日，这是最近的一次
-                                    # 首次涨停应该是这个日期减去(streak_days-1)天
-                                    # 但为了简单，我们只记录最近涨停日
-                                    first_limit_up_time = check_date_str
-                                    break
-                        except:
-                            continue
-                except:
-                    pass
-            
-            # 检测涨停类型
-            is_one_word_limit = False
-            is_t_word_limit = False
-            limit_type = "普通涨停"
-            
-            if is_limit_up and isinstance(change_analysis, dict):
-                limit_up_time = change_analysis.get('涨停时间', '')
-                if limit_up_time and limit_up_time.startswith('09:25'):
-                    is_one_word_limit = True
-                    limit_type = "一字板"
-                    print(f"检测到一字板涨停，涨停时间: {limit_up_time}")
-                elif has_open_limit and has_re_limit:
-                    # 有炸板但重新封板，可能是T字板
-                    is_t_word_limit = True
-                    limit_type = "T字板"
-                    print(f"检测到T字板，有炸板但重新封板")
-                elif has_open_limit:
-                    limit_type = "炸板未回封"
-                else:
-                    limit_type = "普通涨停"
-            
-            # 如果是一字板，即使不在强势股池中也视为强势股
-            if is_one_word_limit and not is_in_strong_pool:
-                print("一字板涨停，自动视为强势股")
-                is_in_strong_pool = True
-            
-            # 生成综合评级
-            rating_info = self._generate_rating(
-                is_limit_up, has_open_limit, has_big_sell, 
-                is_in_炸板_pool, is_in_strong_pool, has_re_limit,
-                is_one_word_limit
-            )
-            
-            # 生成投资建议
-            advice = self._generate_investment_advice(
-                is_limit_up, has_open_limit, has_big_sell, 
-                is_in_炸板_pool, is_in_strong_pool, has_re_limit,
-                is_one_word_limit
-            )
-            
-            # 合并结果
-            comprehensive_result = {
-                '股票代码': symbol_clean,
-                '分析时间': self.current_time.strftime('%Y-%m-%d %H:%M:%S'),
-                '查询日期': self.get_query_date(),
-                '综合评级': rating_info['rating'],
-                '评级说明': rating_info['description'],
-                '投资建议': advice,
-                '涨停异动分析': change_analysis,
-                '炸板检测': 炸板_check,
-                '强势股判断': strong_check,
-                '关键指标': {
-                    '是否涨停': is_limit_up,
-                    '是否有炸板': has_open_limit or is_in_炸板_pool,
-                    '是否漏单': has_big_sell,
-                    '是否重新封板': has_re_limit,
-                    '是否强势股': is_in_strong_pool,
-                    '是否一字板': is_one_word_limit,
-                    '是否T字板': is_t_word_limit,
-                    '涨停类型': limit_type,
-                    '炸板次数': max(
-                        change_analysis.get('炸板次数', 0) if isinstance(change_analysis, dict) else 0,
-                        炸板_check.get('炸板次数', 0) if isinstance(炸板_check, dict) else 0
-                    ),
-                    '最终是否涨停': final_is_limit_up,
-                    '几连板': streak_days,
-                    '首次涨停时间': first_limit_up_time if first_limit_up_time else '未知'
-                }
+        
+        # 检测涨停类型
+        is_one_word_limit = False
+        is_t_word_limit = False
+        limit_type = "普通涨停"
+        
+        if is_limit_up:
+            limit_up_time = ca.get('涨停时间', '')
+            if limit_up_time and limit_up_time.startswith('09:25'):
+                is_one_word_limit = True
+                limit_type = "一字板"
+                logger.info("检测到一字板涨停，涨停时间: %s", limit_up_time)
+            elif has_open_limit and has_re_limit:
+                # 有炸板但重新封板，可能是T字板
+                is_t_word_limit = True
+                limit_type = "T字板"
+                logger.info("检测到T字板，有炸板但重新封板")
+            elif has_open_limit:
+                limit_type = "炸板未回封"
+            else:
+                limit_type = "普通涨停"
+        
+        # 如果是一字板，即使不在强势股池中也视为强势股
+        if is_one_word_limit and not is_in_strong_pool:
+            logger.info("一字板涨停，自动视为强势股")
+            is_in_strong_pool = True
+        
+        # 生成综合评级和投资建议
+        rating_info, advice = self._generate_rating_and_advice(
+            is_limit_up, has_open_limit, has_big_sell, 
+            is_in_炸板_pool, is_in_strong_pool, has_re_limit,
+            is_one_word_limit
+        )
+        
+        # 炸板次数取两项子分析中的较大值
+        open_limit_count = max(ca.get('炸板次数', 0), zb.get('炸板次数', 0))
+        
+        # 合并结果
+        comprehensive_result = {
+            '股票代码': symbol_clean,
+            '分析时间': self.current_time.strftime('%Y-%m-%d %H:%M:%S'),
+            '查询日期': query_date,
+            '综合评级': rating_info['rating'],
+            '评级说明': rating_info['description'],
+            '投资建议': advice,
+            '涨停异动分析': change_analysis,
+            '炸板检测': 炸板_check,
+            '强势股判断': strong_check,
+            '关键指标': {
+                '是否涨停': is_limit_up,
+                '是否有炸板': has_open_limit or is_in_炸板_pool,
+                '是否漏单': has_big_sell,
+                '是否重新封板': has_re_limit,
+                '是否强势股': is_in_strong_pool,
+                '是否一字板': is_one_word_limit,
+                '是否T字板': is_t_word_limit,
+                '涨停类型': limit_type,
+                '炸板次数': open_limit_count,
+                '最终是否涨停': final_is_limit_up,
+                '几连板': streak_days,
+                '首次涨停时间': first_limit_up_time if first_limit_up_time else '未知'
             }
-            
-            print(f"\n综合分析完成!")
-            print(f"综合评级: {comprehensive_result['综合评级']}")
-            print(f"投资建议: {comprehensive_result['投资建议']}")
-            
-            return comprehensive_result
-        except Exception as e:
-            print(f"综合分析过程中发生错误: {e}")
-            # 返回一个基本的错误结果
-            return {
-                '股票代码': str(symbol).zfill(6),
-                '分析时间': self.current_time.strftime('%Y-%m-%d %H:%M:%S'),
-                '查询日期': self.get_query_date(),
-                '综合评级': 'E',
-                '评级说明': f'分析过程中发生错误: {str(e)}',
-                '投资建议': '分析失败，请检查输入或网络连接',
-                '涨停异动分析': {},
-                '炸板检测': {},
-                '强势股判断': {},
-                '关键指标': {
-                    '是否涨停': False,
-                    '是否有炸板': False,
-                    '是否漏单': False,
-                    '是否重新封板': False,
-                    '是否强势股': False,
-                    '炸板次数': 0
-                }
+        }
+        
+        if verbose:
+            logger.info("\n综合分析完成!")
+            logger.info("综合评级: %s", comprehensive_result['综合评级'])
+            logger.info("投资建议: %s", comprehensive_result['投资建议'])
+        
+        return comprehensive_result
+    
+    def _build_error_result(self, symbol: str, e: Exception) -> Dict[str, Any]:
+        """分析出错时返回的基本结果"""
+        return {
+            '股票代码': _pad_code(symbol),
+            '分析时间': self.current_time.strftime('%Y-%m-%d %H:%M:%S'),
+            '查询日期': self.query_date,
+            '综合评级': 'E',
+            '评级说明': f'分析过程中发生错误: {str(e)}',
+            '投资建议': '分析失败，请检查输入或网络连接',
+            '涨停异动分析': {},
+            '炸板检测': {},
+            '强势股判断': {},
+            '关键指标': {
+                '是否涨停': False,
+                '是否有炸板': False,
+                '是否漏单': False,
+                '是否重新封板': False,
+                '是否强势股': False,
+                '炸板次数': 0
             }
+        }
+    
+    def _generate_rating_and_advice(self, is_limit_up: bool, has_open_limit: bool,
+                                    has_big_sell: bool, is_in_炸板_pool: bool,
+                                    is_in_strong_pool: bool, has_re_limit: bool = False,
+                                    is_one_word_limit: bool = False):
+        """同时生成综合评级和投资建议，返回(评级字典, 投资建议)"""
+        flags = (is_limit_up, has_open_limit, has_big_sell,
+                 is_in_炸板_pool, is_in_strong_pool, has_re_limit,
+                 is_one_word_limit)
+        if stock_rating_advisor is not None:
+            return stock_rating_advisor.generate_rating_and_advice(*flags)
+        
+        # 如果模块不存在，使用内联实现
+        logger.warning("无法导入stock_rating_advisor，使用内联实现")
+        rating_info, advice = self._inline_decision_table()[_flag_index(flags)]
+        return dict(rating_info), advice
+    
+    @classmethod
+    def _inline_decision_table(cls):
+        """
+        内联实现的评级/建议查找表
+        
+        首次使用时对全部128种条件组合各运行一次内联判断规则，之后按下标直接查表
+        """
+        if cls._inline_decision is None:
+            cls._inline_decision = tuple(
+                (cls._generate_rating_inline(*flags), cls._generate_investment_advice_inline(*flags))
+                for flags in product((False, True), repeat=7)
+            )
+        return cls._inline_decision
     
     def _generate_rating(self, is_limit_up: bool, has_open_limit: bool, 
                         has_big_sell: bool, is_in_炸板_pool: bool, 
                         is_in_strong_pool: bool, has_re_limit: bool = False,
                         is_one_word_limit: bool = False) -> Dict[str, str]:
         """生成综合评级"""
-        # 导入评级模块
-        try:
-            from stock_rating_advisor import generate_rating
-            return generate_rating(
-                is_limit_up, has_open_limit, has_big_sell,
-                is_in_炸板_pool, is_in_strong_pool, has_re_limit,
-                is_one_word_limit
-            )
-        except ImportError:
-            # 如果模块不存在，使用内联实现
-            print("无法导入stock_rating_advisor，使用内联实现")
-            return self._generate_rating_inline(
+        if stock_rating_advisor is not None:
+            return stock_rating_advisor.generate_rating(
                 is_limit_up, has_open_limit, has_big_sell,
                 is_in_炸板_pool, is_in_strong_pool, has_re_limit,
                 is_one_word_limit
             )
+        
+        # 如果模块不存在，使用内联实现
+        logger.warning("无法导入stock_rating_advisor，使用内联实现")
+        return self._generate_rating_inline(
+            is_limit_up, has_open_limit, has_big_sell,
+            is_in_炸板_pool, is_in_strong_pool, has_re_limit,
+            is_one_word_limit
+        )
     
     def _generate_investment_advice(self, is_limit_up: bool, has_open_limit: bool,
                                    has_big_sell: bool, is_in_炸板_pool: bool,
                                    is_in_strong_pool: bool, has_re_limit: bool = False,
                                    is_one_word_limit: bool = False) -> str:
         """生成投资建议"""
-        # 导入评级模块
-        try:
-            from stock_rating_advisor import generate_investment_advice
-            return generate_investment_advice(
-                is_limit_up, has_open_limit, has_big_sell,
-                is_in_炸板_pool, is_in_strong_pool, has_re_limit,
-                is_one_word_limit
-            )
-        except ImportError:
-            # 如果模块不存在，使用内联实现
-            print("无法导入stock_rating_advisor，使用内联实现")
-            return self._generate_investment_advice_inline(
+        if stock_rating_advisor is not None:
+            return stock_rating_advisor.generate_investment_advice(
                 is_limit_up, has_open_limit, has_big_sell,
                 is_in_炸板_pool, is_in_strong_pool, has_re_limit,
                 is_one_word_limit
             )
+        
+        # 如果模块不存在，使用内联实现
+        logger.warning("无法导入stock_rating_advisor，使用内联实现")
+        return self._generate_investment_advice_inline(
+            is_limit_up, has_open_limit, has_big_sell,
+            is_in_炸板_pool, is_in_strong_pool, has_re_limit,
+            is_one_word_limit
+        )
     
-    def _generate_rating_inline(self, is_limit_up: bool, has_open_limit: bool, 
+    @staticmethod
+    def _generate_rating_inline(is_limit_up: bool, has_open_limit: bool, 
                                has_big_sell: bool, is_in_炸板_pool: bool, 
                                is_in_strong_pool: bool, has_re_limit: bool = False,
                                is_one_word_limit: bool = False) -> Dict[str, str]:
@@ -389,7 +718,8 @@ class StockMonitorAnalysis:
                 'description': "无显著异动"
             }
     
-    def _generate_investment_advice_inline(self, is_limit_up: bool, has_open_limit: bool,
+    @staticmethod
+    def _generate_investment_advice_inline(is_limit_up: bool, has_open_limit: bool,
                                           has_big_sell: bool, is_in_炸板_pool: bool,
                                           is_in_strong_pool: bool, has_re_limit: bool = False,
                                           is_one_word_limit: bool = False) -> str:
@@ -427,47 +757,109 @@ class StockMonitorAnalysis:
         else:
             return "无明显异动，建议继续观察"
     
-    def batch_analysis(self, symbols: List[str]) -> pd.DataFrame:
+    def batch_analysis(self, symbols: List[str], max_concurrency: int = None) -> pd.DataFrame:
         """
         批量分析多只股票
+        
+        各股票的分析在线程池中并发进行，结果顺序与输入一致
+        
+        Args:
+            symbols: 股票代码或名称列表
+            max_concurrency: 同时分析的最大股票数，默认使用构造时的max_workers
         """
-        print(f"\n开始批量分析 {len(symbols)} 只股票...")
+        try:
+            logger.info("\n开始批量分析 %s 只股票...", len(symbols))
+            keys, unique = self._dedupe_symbols(symbols)
+            # 炸板股池和强势股池对所有股票相同，循环前只获取一次
+            pools = self._prefetch_pools() if self._modules_ok and unique else None
+            
+            workers = self.max_workers if max_concurrency is None else max_concurrency
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                analysis_by_key = self._run_batch(pool, unique, pools)
+            
+            return self._collect_batch_results(symbols, keys, analysis_by_key)
+        finally:
+            flush_logs()
+    
+    def _run_batch(self, pool: ThreadPoolExecutor, unique: List[str], pools=None) -> Dict[str, Any]:
+        """在线程池中分析各股票，返回{股票: 分析结果或异常}"""
+        total = len(unique)
         
-        all_results = []
+        def analyze(i: int, symbol: str) -> Dict[str, Any]:
+            logger.info("\n分析第 %s/%s 只股票: %s", i, total, symbol)
+            # 汇总表不包含连板天数和首次涨停时间，不必计算；各股票已并发，子分析逐项执行
+            return self._analyze_symbol(symbol, verbose=False, pools=pools,
+                                        compute_streak=False, compute_first_limit_up=False,
+                                        parallel=False)
         
-        for i, symbol in enumerate(symbols, 1):
+        futures = {pool.submit(analyze, i, symbol): symbol for i, symbol in enumerate(unique, 1)}
+        analysis_by_key = {}
+        for future in as_completed(futures):
             try:
-                print(f"\n分析第 {i}/{len(symbols)} 只股票: {symbol}")
-                
-                # 获取综合分析
-                analysis = self.comprehensive_stock_analysis(symbol)
-                
-                # 提取关键信息
-                stock_result = {
-                    '股票代码': symbol,
-                    '股票名称': analysis.get('涨停异动分析', {}).get('股票代码', ''),
-                    '是否涨停': analysis['关键指标']['是否涨停'],
-                    '是否有炸板': analysis['关键指标']['是否有炸板'],
-                    '是否漏单': analysis['关键指标']['是否漏单'],
-                    '是否重新封板': analysis['关键指标']['是否重新封板'],
-                    '是否强势股': analysis['关键指标']['是否强势股'],
-                    '炸板次数': analysis['关键指标']['炸板次数'],
-                    '综合评级': analysis['综合评级'],
-                    '投资建议': analysis['投资建议']
-                }
+                analysis_by_key[futures[future]] = future.result()
+            except Exception as e:
+                analysis_by_key[futures[future]] = e
+        return analysis_by_key
+    
+    async def batch_analysis_async(self, symbols: List[str], max_concurrency: int = None) -> pd.DataFrame:
+        """批量分析多只股票（异步版本，在线程中调用batch_analysis，参数相同）"""
+        return await asyncio.to_thread(self.batch_analysis, symbols, max_concurrency)
+    
+    def _dedupe_symbols(self, symbols: List[str]):
+        """
+        规范化并去重输入，重复的股票只分析一次
+        
+        Returns:
+            (每个输入对应的规范化键列表, 去重后按首次出现顺序排列的键列表)
+        """
+        keys = [self._normalize_symbol(symbol) for symbol in symbols]
+        return keys, list(dict.fromkeys(keys))
+    
+    def _collect_batch_results(self, symbols: List[str], keys: List[str],
+                               analysis_by_key: Dict[str, Any]) -> pd.DataFrame:
+        """按原输入顺序回填各股票的分析结果，生成汇总表"""
+        # 按列预分配定长数组（布尔标志、整数计数、字符串），逐行按下标填入，
+        # 最后一次性构建DataFrame，无需pandas逐行推断类型
+        n = len(symbols)
+        columns = {
+            name: np.empty(n, dtype=_BATCH_COLUMN_DTYPES[name][0] if name in _BATCH_COLUMN_DTYPES else object)
+            for name in _BATCH_RESULT_COLUMNS
+        }
+        converters = [_BATCH_COLUMN_DTYPES[name][1] if name in _BATCH_COLUMN_DTYPES else None
+                      for name in _BATCH_RESULT_COLUMNS]
+        valid = np.zeros(n, dtype=bool)
+        for i, (symbol, key) in enumerate(zip(symbols, keys)):
+            analysis = analysis_by_key[key]
+            try:
+                if isinstance(analysis, BaseException):
+                    raise analysis
                 
-                all_results.append(stock_result)
+                # 任一字段缺失时该股票整行跳过（不标记为有效）
+                indicators = analysis['关键指标']
+                row = (
+                    symbol,
+                    analysis.get('涨停异动分析', {}).get('股票代码', ''),
+                    *[indicators[name] for name in _BATCH_INDICATOR_COLUMNS],
+                    analysis['综合评级'],
+                    analysis['投资建议'],
+                )
+                for name, convert, value in zip(_BATCH_RESULT_COLUMNS, converters, row):
+                    columns[name][i] = convert(value) if convert else value
                 
             except Exception as e:
-                print(f"分析股票 {symbol} 时出错: {e}")
+                logger.error("分析股票 %s 时出错: %s", symbol, e)
                 continue
+            
+            valid[i] = True
         
-        if all_results:
-            df = pd.DataFrame(all_results)
-            print(f"\n批量分析完成，成功分析 {len(df)} 只股票")
+        if valid.any():
+            if not valid.all():
+                columns = {name: values[valid] for name, values in columns.items()}
+            df = pd.DataFrame(columns)
+            logger.info("\n批量分析完成，成功分析 %s 只股票", len(df))
             return df
         else:
-            print("未成功分析任何股票")
+            logger.warning("未成功分析任何股票")
             return pd.DataFrame()
     
     # 代理方法，用于提供与原模块相同的接口
@@ -495,24 +887,36 @@ class StockMonitorAnalysis:
         """获取强势股池数据"""
         return self.pool_module.get_strong_stocks(date)
     
-    def _get_streak_days(self, symbol: str) -> int:
+    def _get_streak_days(self, symbol: str, query_date: str = None) -> int:
         """
         获取连板天数 - 改进版
         
         Args:
             symbol: 股票代码或名称
+            query_date: 查询日期，为空时使用当前查询日期
             
         Returns:
             连板天数，如果无法获取则返回0
         """
-        # 导入streak计算模块
-        try:
-            from stock_streak_calculator import calculate_streak_days
-            return calculate_streak_days(symbol, self.get_query_date())
-        except ImportError:
-            # 如果模块不存在，使用内联实现
-            print("无法导入stock_streak_calculator，使用内联实现")
-            return self._get_streak_days_inline(symbol)
+        return self._get_streak_info(symbol, query_date)[0]
+    
+    def _get_streak_info(self, symbol: str, query_date: str = None) -> Tuple[int, Optional[str]]:
+        """
+        获取连板天数和计算过程中找到的最近涨停日
+        
+        Args:
+            symbol: 股票代码或名称
+            query_date: 查询日期，为空时使用当前查询日期
+            
+        Returns:
+            (连板天数, 最近涨停日YYYYMMDD)；最近涨停日未知时为None
+        """
+        if calculate_streak_info is not None:
+            return calculate_streak_info(symbol, query_date or self.query_date)
+        
+        # 如果模块不存在，使用内联实现
+        logger.warning("无法导入stock_streak_calculator，使用内联实现")
+        return self._get_streak_days_inline(symbol), None
     
     def _get_streak_days_inline(self, symbol: str) -> int:
         """
@@ -521,25 +925,23 @@ class StockMonitorAnalysis:
         # 简化的内联实现
         try:
             # 尝试从 stock_data_fetcher 获取
-            from stock_data_fetcher import get_stock_info
-            stock_info = get_stock_info(symbol)
+            stock_info = get_stock_info(symbol) if get_stock_info else None
             if stock_info:
                 # 尝试从多个可能的字段中提取连板天数
-                import re
-                for field in ['连板数', '连续涨停天数', 'streak', '连板天数', '涨停天数', '连板高度']:
+                for field in _STREAK_FIELDS:
                     if field in stock_info:
                         value = stock_info[field]
                         if isinstance(value, (int, float)):
                             result = int(value)
                             if result >= 1:
-                                print(f"从 stock_data_fetcher 获取到连板天数: {result}")
+                                logger.info("从 stock_data_fetcher 获取到连板天数: %s", result)
                                 return result
                         elif isinstance(value, str):
-                            match = re.search(r'(\d+)', value)
+                            match = _FIRST_INT_RE.search(value)
                             if match:
                                 result = int(match.group(1))
                                 if result >= 1:
-                                    print(f"从 stock_data_fetcher 字段 {field} 提取到连板天数: {result}")
+                                    logger.info("从 stock_data_fetcher 字段 %s 提取到连板天数: %s", field, result)
                                     return result
         except:
             pass
@@ -560,66 +962,26 @@ class StockMonitorAnalysis:
             False: 不在涨停板池中（有数据）
             None: 无法获取数据（可能是非交易日）
         """
-        try:
-            # 使用 akshare 的 stock_zt_pool_em 接口获取指定日期的涨停板池数据
-            import akshare as ak
-            
-            # 检查缓存
-            cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stock_data_cache")
-            cache_key = f"limit_pool_{date_str}"
-            cache_file = os.path.join(cache_dir, f"{cache_key}.csv")
-            
-            df = None
-            if os.path.exists(cache_file):
-                try:
-                    df = pd.read_csv(cache_file)
-                    # 检查缓存是否有效（非空）
-                    if df is not None and not df.empty:
-                        # 检查股票是否在涨停板池中
-                        if '代码' in df.columns:
-                            symbol_clean = str(symbol).zfill(6)
-                            is_in_pool = symbol_clean in df['代码'].values
-                            return is_in_pool
-                        else:
-                            return False
-                except Exception as e:
-                    print(f"读取涨停板池缓存失败: {e}")
-                    df = None
+        codes = self._get_limit_pool_codes(date_str)
+        if codes is None:
+            return None
+        return _pad_code(symbol) in codes
+    
+    def _get_limit_pool_codes(self, date_str: str):
+        """
+        获取指定日期涨停板池中的股票代码集合（进程内按日期缓存）
+        
+        Args:
+            date_str: 日期字符串 (YYYYMMDD)
             
-            # 如果缓存不存在或无效，从接口获取
-            try:
-                df = ak.stock_zt_pool_em(date=date_str)
-                
-                if df is None:
-                    # 接口返回None，可能是非交易日或数据不可用
-                    return None
-                
-                if df.empty:
-                    # 空DataFrame，可能是非交易日
-                    return None
-                
-                # 保存到缓存
-                try:
-                    if not os.path.exists(cache_dir):
-                        os.makedirs(cache_dir)
-                    df.to_csv(cache_file, index=False, encoding='utf-8-sig')
-                except Exception as e:
-                    print(f"保存涨停板池缓存失败: {e}")
-                
-                # 检查股票是否在涨停板池中
-                if '代码' in df.columns:
-                    symbol_clean = str(symbol).zfill(6)
-                    is_in_pool = symbol_clean in df['代码'].values
-                    return is_in_pool
-                else:
-                    return False
-                    
-            except Exception as e:
-                # 接口调用失败，可能是非交易日或网络问题
-                return None
-                
+        Returns:
+            股票代码集合；无法获取数据（可能是非交易日）时返回None
+        """
+        try:
+            return get_limit_pool_codes(date_str)
         except Exception as e:
-            print(f"检查涨停板池失败: {e}")
+            # 接口调用失败，可能是非交易日或网络问题
+            logger.debug("获取 %s 涨停板池失败: %s", date_str, e)
             return None
     
     def get_board_changes(self) -> pd.DataFrame:
@@ -9,7 +9,7 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 import time
 from typing import Dict, List, Optional, Any, Union
 import warnings
@@ -20,23 +20,28 @@ class StockMonitorBase:
     
     def __init__(self):
         """初始化"""
-        self.tz_shanghai = pytz.timezone('Asia/Shanghai')
-        self.current_time = datetime.now(self.tz_shanghai)
+        self.tz_shanghai = ZoneInfo('Asia/Shanghai')
         self.data_update_hour = 16  # 数据更新时间点
-        
+    
+    @property
+    def current_time(self) -> datetime:
+        """当前上海时间（每次读取都是最新时间，长时间运行的进程不会停留在创建对象的时刻）"""
+        return datetime.now(self.tz_shanghai)
+    
     def get_query_date(self) -> str:
         """
         根据当前时间确定查询日期
         规则: 16点前查前一个交易日，16点后查当天
         """
-        current_hour = self.current_time.hour
+        now = self.current_time
+        current_hour = now.hour
         
         if current_hour < self.data_update_hour:
             # 16点前，查询前一个交易日
-            query_date = (self.current_time - timedelta(days=1)).strftime('%Y%m%d')
+            query_date = (now - timedelta(days=1)).strftime('%Y%m%d')
         else:
             # 16点后，查询当天
-            query_date = self.current_time.strftime('%Y%m%d')
+            query_date = now.strftime('%Y%m%d')
         
         print(f"监控模块查询日期: {query_date}")
         return query_date
@@ -10,33 +10,43 @@ import akshare as ak
 import pandas as pd
 from datetime import datetime, time as datetime_time
 from typing import Dict, List, Any, Optional
-import pytz
+from zoneinfo import ZoneInfo
 from datetime import timedelta
 
+from stock_log import get_logger
+from stock_limit_pool import get_limit_pool_codes
+
+logger = get_logger("monitor_changes")
+
 class StockMonitorChanges:
     """股票异动信息查询类（修复版）"""
     
     def __init__(self):
         """初始化"""
-        self.tz_shanghai = pytz.timezone('Asia/Shanghai')
-        self.current_time = datetime.now(self.tz_shanghai)
+        self.tz_shanghai = ZoneInfo('Asia/Shanghai')
         self.data_update_hour = 16
-        
+    
+    @property
+    def current_time(self) -> datetime:
+        """当前上海时间（每次读取都是最新时间，长时间运行的进程不会停留在创建对象的时刻）"""
+        return datetime.now(self.tz_shanghai)
+    
     def get_query_date(self) -> str:
         """
         根据当前时间确定查询日期
         规则: 16点前查前一个交易日，16点后查当天
         """
-        current_hour = self.current_time.hour
+        now = self.current_time
+        current_hour = now.hour
         
         if current_hour < self.data_update_hour:
             # 16点前，查询前一个交易日
-            query_date = (self.current_time - timedelta(days=1)).strftime('%Y%m%d')
+            query_date = (now - timedelta(days=1)).strftime('%Y%m%d')
         else:
             # 16点后，查询当天
-            query_date = self.current_time.strftime('%Y%m%d')
+            query_date = now.strftime('%Y%m%d')
         
-        print(f"监控模块查询日期: {query_date}")
+        logger.info("监控模块查询日期: %s", query_date)
         return query_date
     
     def get_stock_changes(self, change_type: str = "封涨停板") -> pd.DataFrame:
@@ -48,22 +58,22 @@ class StockMonitorChanges:
             
             # 修复：检查返回是否为None或空DataFrame
             if df is None:
-                print(f"获取异动数据返回None: {change_type}")
+                logger.info("获取异动数据返回None: %s", change_type)
                 return pd.DataFrame()
             
             if df.empty:
-                print(f"未获取到 '{change_type}' 异动数据")
+                logger.info("未获取到 '%s' 异动数据", change_type)
                 return pd.DataFrame()
             
             # 标准化代码列
             if '代码' in df.columns:
                 df['代码'] = df['代码'].astype(str).str.zfill(6)
             
-            print(f"获取到 '{change_type}' 异动数据 {len(df)} 条")
+            logger.info("获取到 '%s' 异动数据 %s 条", change_type, len(df))
             return df
             
         except Exception as e:
-            print(f"获取异动数据失败 ({change_type}): {e}")
+            logger.error("获取异动数据失败 (%s): %s", change_type, e)
             return pd.DataFrame()
     
     def analyze_limit_up_changes(self, symbol: str) -> Dict[str, Any]:
@@ -77,7 +87,7 @@ class StockMonitorChanges:
         """
         symbol_clean = str(symbol).zfill(6)
         
-        print(f"\n开始分析 {symbol_clean} 的涨停异动情况...")
+        logger.info("\n开始分析 %s 的涨停异动情况...", symbol_clean)
         
         # 1. 获取所有涨停时间（可能有多次封板）
         limit_up_df = self.get_stock_changes("封涨停板")
@@ -160,29 +170,29 @@ class StockMonitorChanges:
                         last_limit_dt = self._parse_time_to_datetime(last_limit_time, self.get_query_date())
                         last_open_dt = self._parse_time_to_datetime(last_open_time, self.get_query_date())
                     
-                        print(f"调试信息: 最后涨停时间 {last_limit_time} -> {last_limit_dt}")
-                        print(f"调试信息: 最后炸板时间 {last_open_time} -> {last_open_dt}")
-                        print(f"调试信息: 查询日期 {self.get_query_date()}")
+                        logger.debug("调试信息: 最后涨停时间 %s -> %s", last_limit_time, last_limit_dt)
+                        logger.debug("调试信息: 最后炸板时间 %s -> %s", last_open_time, last_open_dt)
+                        logger.debug("调试信息: 查询日期 %s", self.get_query_date())
                     
                         if last_limit_dt and last_open_dt:
                             if last_limit_dt > last_open_dt:
                                 # 重新封板了，以最后一次封板时间为基准
                                 base_limit_time = last_limit_time
                                 has_re_limit = True
-                                print(f"股票{symbol_clean}有炸板后重新封板，基准时间: {base_limit_time}")
+                                logger.info("股票%s有炸板后重新封板，基准时间: %s", symbol_clean, base_limit_time)
                             else:
                                 # 炸板后没有重新封板，但如果在涨停板池中，说明最终封板了
                                 if is_in_limit_pool:
                                     has_re_limit = True
                                     base_limit_time = last_limit_time
-                                    print(f"股票{symbol_clean}有炸板但最终封板（在涨停板池中），基准时间: {base_limit_time}")
+                                    logger.info("股票%s有炸板但最终封板（在涨停板池中），基准时间: %s", symbol_clean, base_limit_time)
                                 else:
                                     # 炸板后没有重新封板
-                                    print(f"股票{symbol_clean}有炸板但没有重新封板，不检查漏单")
-                                    print(f"原因: 最后涨停时间 {last_limit_dt} 不在最后炸板时间 {last_open_dt} 之后")
+                                    logger.info("股票%s有炸板但没有重新封板，不检查漏单", symbol_clean)
+                                    logger.info("原因: 最后涨停时间 %s 不在最后炸板时间 %s 之后", last_limit_dt, last_open_dt)
                         else:
-                            print(f"股票{symbol_clean}时间解析失败，无法确定是否重新封板")
-                            print(f"last_limit_dt: {last_limit_dt}, last_open_dt: {last_open_dt}")
+                            logger.warning("股票%s时间解析失败，无法确定是否重新封板", symbol_clean)
+                            logger.debug("last_limit_dt: %s, last_open_dt: %s", last_limit_dt, last_open_dt)
                     else:
                         # 没有炸板时间，应该不会到这里
                         base_limit_time = limit_up_times[0]
@@ -198,7 +208,7 @@ class StockMonitorChanges:
         
         # 5. 如果不在涨停板池中，但之前认为重新封板了，需要重新评估
         if has_re_limit and not is_in_limit_pool:
-            print(f"注意: 股票{symbol_clean}被认为重新封板，但不在涨停板池中，重新评估...")
+            logger.warning("注意: 股票%s被认为重新封板，但不在涨停板池中，重新评估...", symbol_clean)
             # 这里可以添加更复杂的逻辑，但暂时保持原样
         
         # 4. 检查是否有大笔卖出（漏单）- 修改逻辑
@@ -270,7 +280,7 @@ class StockMonitorChanges:
             '是否在涨停板池中': is_in_limit_pool
         }
         
-        print(f"异动分析完成: {result['异动分析总结']}")
+        logger.info("异动分析完成: %s", result['异动分析总结'])
         return result
     
     def _get_tick_data(self, symbol: str, date: str = None) -> pd.DataFrame:
@@ -293,13 +303,13 @@ class StockMonitorChanges:
             df = ak.stock_zh_a_tick_tx_js(symbol=symbol, trade_date=date)
             
             if df is None or df.empty:
-                print(f"未获取到 {symbol} 的分时成交数据")
+                logger.info("未获取到 %s 的分时成交数据", symbol)
                 return pd.DataFrame()
             
             return df
             
         except Exception as e:
-            print(f"获取分时成交数据失败 {symbol}: {e}")
+            logger.error("获取分时成交数据失败 %s: %s", symbol, e)
             return pd.DataFrame()
     
     def _check_leak_condition(self, tick_data: pd.DataFrame, check_time: str) -> bool:
@@ -329,7 +339,7 @@ class StockMonitorChanges:
             # 由于分时数据获取可能不完整，这里简化处理
             return True  # 简化处理，总是返回True
         except Exception as e:
-            print(f"检查漏单条件失败: {check_time}, 错误: {e}")
+            logger.error("检查漏单条件失败: %s, 错误: %s", check_time, e)
             return False
     
     def _format_time(self, time_value) -> str:
@@ -361,7 +371,7 @@ class StockMonitorChanges:
             # 其他类型转换为字符串
             return str(time_value)
         except Exception as e:
-            print(f"格式化时间失败: {time_value}, 错误: {e}")
+            logger.error("格式化时间失败: %s, 错误: %s", time_value, e)
             return str(time_value)
     
     def _parse_time_to_datetime(self, time_str: str, date_str: str) -> Optional[datetime]:
@@ -405,13 +415,13 @@ class StockMonitorChanges:
                     time_str_clean = f"{time_str_clean[:2]}:{time_str_clean[2:4]}"
                     time_part = datetime.strptime(time_str_clean, '%H:%M')
                 else:
-                    print(f"无法解析时间格式: {time_str}")
+                    logger.warning("无法解析时间格式: %s", time_str)
                     return None
             
             # 合并日期和时间
             return datetime.combine(date_part.date(), time_part.time())
         except Exception as e:
-            print(f"解析时间失败: {date_str} {time_str}, 错误: {e}")
+            logger.error("解析时间失败: %s %s, 错误: %s", date_str, time_str, e)
             return None
     
     def _check_if_in_limit_pool(self, symbol: str) -> bool:
@@ -425,30 +435,24 @@ class StockMonitorChanges:
             是否在涨停板池中
         """
         try:
-            # 使用 akshare 的 stock_zt_pool_em 接口获取涨停板池数据
-            import akshare as ak
-            df = ak.stock_zt_pool_em(date=self.get_query_date())
+            # 与连板计算共用按日期缓存的涨停板池（同时读写本地缓存文件）
+            codes = get_limit_pool_codes(self.get_query_date())
             
-            if df is None or df.empty:
-                print(f"未获取到涨停板池数据")
+            if codes is None:
+                logger.info("未获取到涨停板池数据")
                 return False
             
-            # 检查股票是否在涨停板池中
-            # 注意：列名可能需要调整
-            if '代码' in df.columns:
-                symbol_clean = str(symbol).zfill(6)
-                is_in_pool = symbol_clean in df['代码'].values
-                if is_in_pool:
-                    print(f"股票{symbol_clean}在涨停板池中")
-                else:
-                    print(f"股票{symbol_clean}不在涨停板池中")
-                return is_in_pool
+            # 检查股票是否在涨停板池中（集合查找，不再逐行扫描代码列）
+            symbol_clean = str(symbol).zfill(6)
+            is_in_pool = symbol_clean in codes
+            if is_in_pool:
+                logger.info("股票%s在涨停板池中", symbol_clean)
             else:
-                print(f"涨停板池数据中没有'代码'列")
-                return False
+                logger.info("股票%s不在涨停板池中", symbol_clean)
+            return is_in_pool
                 
         except Exception as e:
-            print(f"检查涨停板池失败: {e}")
+            logger.error("检查涨停板池失败: %s", e)
             return False
     
     def _generate_change_summary(self, is_limit_up: bool, has_open_limit: bool, 
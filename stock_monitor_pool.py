@@ -10,40 +10,49 @@ import akshare as ak
 import pandas as pd
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 
 import os
 
+from stock_log import get_logger
+
+logger = get_logger("monitor_pool")
+
 class StockMonitorPool:
     """股票池数据查询类（修复版）"""
     
     def __init__(self):
         """初始化"""
-        self.tz_shanghai = pytz.timezone('Asia/Shanghai')
-        self.current_time = datetime.now(self.tz_shanghai)
+        self.tz_shanghai = ZoneInfo('Asia/Shanghai')
         self.data_update_hour = 16
         
         # 创建缓存目录
         self.cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stock_data_cache")
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
-            print(f"创建缓存目录: {self.cache_dir}")
-        
+            logger.debug("创建缓存目录: %s", self.cache_dir)
+    
+    @property
+    def current_time(self) -> datetime:
+        """当前上海时间（每次读取都是最新时间，长时间运行的进程不会停留在创建对象的时刻）"""
+        return datetime.now(self.tz_shanghai)
+    
     def get_query_date(self) -> str:
         """
         根据当前时间确定查询日期
         规则: 16点前查前一个交易日，16点后查当天
         """
-        current_hour = self.current_time.hour
+        now = self.current_time
+        current_hour = now.hour
         
         if current_hour < self.data_update_hour:
             # 16点前，查询前一个交易日
-            query_date = (self.current_time - timedelta(days=1)).strftime('%Y%m%d')
+            query_date = (now - timedelta(days=1)).strftime('%Y%m%d')
         else:
             # 16点后，查询当天
-            query_date = self.current_time.strftime('%Y%m%d')
+            query_date = now.strftime('%Y%m%d')
         
-        print(f"监控模块查询日期: {query_date}")
+        logger.info("监控模块查询日期: %s", query_date)
         return query_date
     
     def get_炸板_stocks(self, date: str = None) -> pd.DataFrame:
@@ -61,24 +70,24 @@ class StockMonitorPool:
         # 检查缓存是否存在
         if os.path.exists(cache_file):
             try:
-                print(f"从缓存加载炸板股池数据，日期: {date}")
+                logger.debug("从缓存加载炸板股池数据，日期: %s", date)
                 df = pd.read_csv(cache_file)
                 if not df.empty:
-                    print(f"从缓存获取到炸板股池数据 {len(df)} 条，日期: {date}")
+                    logger.info("从缓存获取到炸板股池数据 %s 条，日期: %s", len(df), date)
                     return df
             except Exception as e:
-                print(f"读取炸板股池缓存失败: {e}")
+                logger.error("读取炸板股池缓存失败: %s", e)
         
         # 缓存不存在或无效，从接口获取
         try:
             df = ak.stock_zt_pool_zbgc_em(date=date)
             
             if df is None:
-                print(f"获取炸板股池数据返回None，日期: {date}")
+                logger.info("获取炸板股池数据返回None，日期: %s", date)
                 return pd.DataFrame()
             
             if df.empty:
-                print(f"未获取到炸板股池数据，日期: {date}")
+                logger.info("未获取到炸板股池数据，日期: %s", date)
                 return pd.DataFrame()
             
             if '代码' in df.columns:
@@ -87,15 +96,15 @@ class StockMonitorPool:
             # 保存到缓存
             try:
                 df.to_csv(cache_file, index=False, encoding='utf-8-sig')
-                print(f"已缓存炸板股池数据到 {cache_file}")
+                logger.debug("已缓存炸板股池数据到 %s", cache_file)
             except Exception as e:
-                print(f"保存炸板股池缓存失败: {e}")
+                logger.error("保存炸板股池缓存失败: %s", e)
             
-            print(f"获取到炸板股池数据 {len(df)} 条，日期: {date}")
+            logger.info("获取到炸板股池数据 %s 条，日期: %s", len(df), date)
             return df
             
         except Exception as e:
-            print(f"获取炸板股池数据失败，日期 {date}: {e}")
+            logger.error("获取炸板股池数据失败，日期 %s: %s", date, e)
             return pd.DataFrame()
     
     def check_if_炸板(self, symbol: str, date: str = None) -> Dict[str, Any]:
@@ -107,7 +116,7 @@ class StockMonitorPool:
         if date is None:
             date = self.get_query_date()
         
-        print(f"\n开始检查 {symbol_clean} 是否炸板...")
+        logger.info("\n开始检查 %s 是否炸板...", symbol_clean)
         
         # 获取炸板股池数据
         炸板_df = self.get_炸板_stocks(date)
@@ -155,11 +164,11 @@ class StockMonitorPool:
                 
                 result['炸板详情'] = detail
                 
-                print(f"检查完成: 在炸板股池中，{detail}")
+                logger.info("检查完成: 在炸板股池中，%s", detail)
             else:
-                print(f"检查完成: 不在炸板股池中")
+                logger.info("检查完成: 不在炸板股池中")
         else:
-            print(f"检查完成: 炸板股池无数据")
+            logger.info("检查完成: 炸板股池无数据")
         
         return result
     
@@ -184,7 +193,7 @@ class StockMonitorPool:
             
             return str(time_value)
         except Exception as e:
-            print(f"格式化时间失败: {time_value}, 错误: {e}")
+            logger.error("格式化时间失败: %s, 错误: %s", time_value, e)
             return str(time_value)
     
     def get_strong_stocks(self, date: str = None) -> pd.DataFrame:
@@ -202,24 +211,24 @@ class StockMonitorPool:
         # 检查缓存是否存在
         if os.path.exists(cache_file):
             try:
-                print(f"从缓存加载强势股池数据，日期: {date}")
+                logger.debug("从缓存加载强势股池数据，日期: %s", date)
                 df = pd.read_csv(cache_file)
                 if not df.empty:
-                    print(f"从缓存获取到强势股池数据 {len(df)} 条，日期: {date}")
+                    logger.info("从缓存获取到强势股池数据 %s 条，日期: %s", len(df), date)
                     return df
             except Exception as e:
-                print(f"读取强势股池缓存失败: {e}")
+                logger.error("读取强势股池缓存失败: %s", e)
         
         # 缓存不存在或无效，从接口获取
         try:
             df = ak.stock_zt_pool_strong_em(date=date)
             
             if df is None:
-                print(f"获取强势股池数据返回None，日期: {date}")
+                logger.info("获取强势股池数据返回None，日期: %s", date)
                 return pd.DataFrame()
             
             if df.empty:
-                print(f"未获取到强势股池数据，日期: {date}")
+                logger.info("未获取到强势股池数据，日期: %s", date)
                 return pd.DataFrame()
             
             if '代码' in df.columns:
@@ -228,15 +237,15 @@ class StockMonitorPool:
             # 保存到缓存
             try:
                 df.to_csv(cache_file, index=False, encoding='utf-8-sig')
-                print(f"已缓存强势股池数据到 {cache_file}")
+                logger.debug("已缓存强势股池数据到 %s", cache_file)
             except Exception as e:
-                print(f"保存强势股池缓存失败: {e}")
+                logger.error("保存强势股池缓存失败: %s", e)
             
-            print(f"获取到强势股池数据 {len(df)} 条，日期: {date}")
+            logger.info("获取到强势股池数据 %s 条，日期: %s", len(df), date)
             return df
             
         except Exception as e:
-            print(f"获取强势股池数据失败，日期 {date}: {e}")
+            logger.error("获取强势股池数据失败，日期 %s: %s", date, e)
             return pd.DataFrame()
     
     def check_if_strong_stock(self, symbol: str, date: str = None) -> Dict[str, Any]:
@@ -248,7 +257,7 @@ class StockMonitorPool:
         if date is None:
             date = self.get_query_date()
         
-        print(f"\n开始检查 {symbol_clean} 是否为强势股...")
+        logger.info("\n开始检查 %s 是否为强势股...", symbol_clean)
         
         # 获取强势股池数据
         strong_df = self.get_strong_stocks(date)
@@ -282,11 +291,11 @@ class StockMonitorPool:
                     '涨速': stock_row.get('涨速', None)
                 })
                 
-                print(f"检查完成: 在强势股池中，入选理由: {result['入选理由']}")
+                logger.info("检查完成: 在强势股池中，入选理由: %s", result['入选理由'])
             else:
-                print(f"检查完成: 不在强势股池中")
+                logger.info("检查完成: 不在强势股池中")
         else:
-            print(f"检查完成: 强势股池无数据")
+            logger.info("检查完成: 强势股池无数据")
         
         return result
     
@@ -303,36 +312,36 @@ class StockMonitorPool:
         # 检查缓存是否存在
         if os.path.exists(cache_file):
             try:
-                print(f"从缓存加载板块异动数据")
+                logger.debug("从缓存加载板块异动数据")
                 df = pd.read_csv(cache_file)
                 if not df.empty:
-                    print(f"从缓存获取到板块异动数据 {len(df)} 条")
+                    logger.info("从缓存获取到板块异动数据 %s 条", len(df))
                     return df
             except Exception as e:
-                print(f"读取板块异动缓存失败: {e}")
+                logger.error("读取板块异动缓存失败: %s", e)
         
         # 缓存不存在或无效，从接口获取
         try:
             df = ak.stock_board_change_em()
             
             if df is None:
-                print("获取板块异动数据返回None")
+                logger.info("获取板块异动数据返回None")
                 return pd.DataFrame()
             
             if df.empty:
-                print("未获取到板块异动数据")
+                logger.info("未获取到板块异动数据")
                 return pd.DataFrame()
             
             # 保存到缓存
             try:
                 df.to_csv(cache_file, index=False, encoding='utf-8-sig')
-                print(f"已缓存板块异动数据到 {cache_file}")
+                logger.debug("已缓存板块异动数据到 %s", cache_file)
             except Exception as e:
-                print(f"保存板块异动缓存失败: {e}")
+                logger.error("保存板块异动缓存失败: %s", e)
             
-            print(f"获取到板块异动数据 {len(df)} 条")
+            logger.info("获取到板块异动数据 %s 条", len(df))
             return df
             
         except Exception as e:
-            print(f"获取板块异动数据失败: {e}")
+            logger.error("获取板块异动数据失败: %s", e)
             return pd.DataFrame()
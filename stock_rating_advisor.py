@@ -4,13 +4,14 @@
 股票评级和建议生成模块 - 从stock_monitor_analysis.py拆分出来
 """
 
-from typing import Dict
+from itertools import product
+from typing import Dict, Tuple
 
-def generate_rating(is_limit_up: bool, has_open_limit: bool, 
+def _rating_cascade(is_limit_up: bool, has_open_limit: bool, 
                    has_big_sell: bool, is_in_炸板_pool: bool, 
                    is_in_strong_pool: bool, has_re_limit: bool = False,
                    is_one_word_limit: bool = False) -> Dict[str, str]:
-    """生成综合评级"""
+    """综合评级判断规则（仅用于生成查找表）"""
     # 如果有炸板但没有重新封板，评级较低
     if has_open_limit and not has_re_limit:
         return {
@@ -83,11 +84,11 @@ def generate_rating(is_limit_up: bool, has_open_limit: bool,
             'description': "无显著异动"
         }
 
-def generate_investment_advice(is_limit_up: bool, has_open_limit: bool,
+def _advice_cascade(is_limit_up: bool, has_open_limit: bool,
                               has_big_sell: bool, is_in_炸板_pool: bool,
                               is_in_strong_pool: bool, has_re_limit: bool = False,
                               is_one_word_limit: bool = False) -> str:
-    """生成投资建议"""
+    """投资建议判断规则（仅用于生成查找表）"""
     # 如果有炸板但没有重新封板
     if has_open_limit and not has_re_limit:
         return "炸板后未重新封板，走势疲弱，建议回避"
@@ -120,3 +121,54 @@ def generate_investment_advice(is_limit_up: bool, has_open_limit: bool,
         return "存在漏单，主力可能出逃，建议回避"
     else:
         return "无明显异动，建议继续观察"
+
+
+def _flag_index(is_limit_up: bool, has_open_limit: bool, has_big_sell: bool,
+                is_in_炸板_pool: bool, is_in_strong_pool: bool, has_re_limit: bool,
+                is_one_word_limit: bool) -> int:
+    """把7个判断条件编码为查找表下标（参数顺序即从高位到低位）"""
+    return ((bool(is_limit_up) << 6) | (bool(has_open_limit) << 5) | (bool(has_big_sell) << 4)
+            | (bool(is_in_炸板_pool) << 3) | (bool(is_in_strong_pool) << 2)
+            | (bool(has_re_limit) << 1) | bool(is_one_word_limit))
+
+# 模块加载时对全部128种条件组合各运行一次判断规则，之后按下标直接查表
+# product按从高位到低位的顺序枚举，第i个组合的编码恰好为i
+# 每项为(评级, 评级说明, 投资建议)，评级和建议一次查表同时得到
+_DECISION_TABLE: Tuple[Tuple[str, str, str], ...] = tuple(
+    (r['rating'], r['description'], _advice_cascade(*flags))
+    for flags, r in (
+        (flags, _rating_cascade(*flags)) for flags in product((False, True), repeat=7)
+    )
+)
+
+def generate_rating_and_advice(is_limit_up: bool, has_open_limit: bool,
+                               has_big_sell: bool, is_in_炸板_pool: bool,
+                               is_in_strong_pool: bool, has_re_limit: bool = False,
+                               is_one_word_limit: bool = False) -> Tuple[Dict[str, str], str]:
+    """同时生成综合评级和投资建议，返回(评级字典, 投资建议)"""
+    rating, description, advice = _DECISION_TABLE[_flag_index(
+        is_limit_up, has_open_limit, has_big_sell, is_in_炸板_pool,
+        is_in_strong_pool, has_re_limit, is_one_word_limit
+    )]
+    return {'rating': rating, 'description': description}, advice
+
+def generate_rating(is_limit_up: bool, has_open_limit: bool, 
+                   has_big_sell: bool, is_in_炸板_pool: bool, 
+                   is_in_strong_pool: bool, has_re_limit: bool = False,
+                   is_one_word_limit: bool = False) -> Dict[str, str]:
+    """生成综合评级"""
+    rating, description, _ = _DECISION_TABLE[_flag_index(
+        is_limit_up, has_open_limit, has_big_sell, is_in_炸板_pool,
+        is_in_strong_pool, has_re_limit, is_one_word_limit
+    )]
+    return {'rating': rating, 'description': description}
+
+def generate_investment_advice(is_limit_up: bool, has_open_limit: bool,
+                              has_big_sell: bool, is_in_炸板_pool: bool,
+                              is_in_strong_pool: bool, has_re_limit: bool = False,
+                              is_one_word_limit: bool = False) -> str:
+    """生成投资建议"""
+    return _DECISION_TABLE[_flag_index(
+        is_limit_up, has_open_limit, has_big_sell, is_in_炸板_pool,
+        is_in_strong_pool, has_re_limit, is_one_word_limit
+    )][2]
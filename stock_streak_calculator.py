@@ -5,9 +5,129 @@
 """
 
 import re
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+
+from stock_log import get_logger
+from stock_limit_pool import get_limit_pool, get_limit_pool_codes
+
+logger = get_logger("streak_calculator")
+
+try:
+    import akshare as ak
+except ImportError:
+    ak = None
+
+try:
+    from stock_name_resolver import get_stock_code_by_name
+except ImportError:
+    get_stock_code_by_name = None
+
+try:
+    from stock_data_fetcher import get_stock_info
+except ImportError:
+    get_stock_info = None
+
+# 从“3连板”“5天4板”等文本中提取第一个整数
+_FIRST_INT_RE = re.compile(r'(\d+)')
+
+# 日线回溯的自然日天数（覆盖约30个交易日）
+_HISTORY_LOOKBACK_DAYS = 45
+
+def _limit_up_ratios(stock_code: str) -> Tuple[float, ...]:
+    """
+    可能的涨停幅度：科创板/创业板20%，北交所30%，其余10%；
+    主板ST股为5%，日线数据无法区分是否ST，10%和5%都作为候选（由涨停板池确认）
+    """
+    if stock_code.startswith(('688', '689', '300', '301')):
+        return (0.2,)
+    if stock_code.startswith(('4', '8', '92')):
+        return (0.3,)
+    return (0.1, 0.05)
+
+def _limit_up_candidates(close: np.ndarray, ratios: Tuple[float, ...]) -> np.ndarray:
+    """
+    按前收盘价计算涨停价（四舍五入到分），收盘价等于涨停价的交易日为候选涨停日
+    
+    Args:
+        close: 按日期升序排列的收盘价
+        ratios: 可能的涨停幅度
+        
+    Returns:
+        与close等长的布尔数组（第一天没有前收盘价，不作为候选）
+    """
+    prev = np.empty_like(close)
+    prev[0] = np.nan
+    prev[1:] = close[:-1]
+    is_candidate = np.zeros(len(close), dtype=bool)
+    with np.errstate(invalid='ignore'):
+        for ratio in ratios:
+            # 交易所按四舍五入计算涨停价，加一个很小的数避免二进制误差导致少进一分
+            limit_price = np.floor(prev * (1 + ratio) * 100 + 0.5 + 1e-6) / 100
+            is_candidate |= np.abs(close - limit_price) < 0.005
+    return is_candidate
+
+def _confirmed_in_pool(stock_code: str, date_str: str) -> Optional[bool]:
+    """按涨停板池确认指定日期是否涨停；涨停板池无数据或获取失败时返回None"""
+    try:
+        codes = get_limit_pool_codes(date_str)
+    except Exception as e:
+        logger.debug("获取 %s 涨停板池失败: %s", date_str, e)
+        return None
+    return None if codes is None else stock_code in codes
+
+def _compute_streak_from_history(stock_code: str, query_date: str) -> Optional[Tuple[int, Optional[str]]]:
+    """
+    一次获取近期日线数据，按涨停价选出候选涨停日，再逐日用涨停板池确认，计算连板天数
+    
+    日线数据只用来确定交易日和候选日：非交易日和收盘价不等于涨停价的交易日
+    不必查询涨停板池；候选日以涨停板池为准，涨停板池无数据时按涨停价判断
+    
+    Args:
+        stock_code: 6位股票代码
+        query_date: 查询日期 (YYYYMMDD)
+        
+    Returns:
+        (连板天数, 最近涨停日YYYYMMDD或None)；获取日线数据失败时返回None（调用方退回涨停板池逐日检查）
+    """
+    if ak is None:
+        return None
+    
+    end_dt = datetime.strptime(query_date, '%Y%m%d')
+    start_date = (end_dt - timedelta(days=_HISTORY_LOOKBACK_DAYS)).strftime('%Y%m%d')
+    try:
+        df = ak.stock_zh_a_hist(symbol=stock_code, period="daily",
+                                start_date=start_date, end_date=query_date, adjust="")
+    except Exception as e:
+        logger.warning("获取日线数据失败: %s", e)
+        return None
+    
+    if df is None or df.empty or '收盘' not in df.columns or '日期' not in df.columns:
+        return None
+    df = df.sort_values('日期')
+    
+    close = pd.to_numeric(df['收盘'], errors='coerce').to_numpy(dtype=float)
+    is_candidate = _limit_up_candidates(close, _limit_up_ratios(stock_code))
+    dates = pd.to_datetime(df['日期'], errors='coerce').dt.strftime('%Y%m%d').tolist()
+    
+    # 与涨停板池逐日检查一致：从最近一个涨停日起，统计向前连续涨停的交易日数
+    streak_days = 0
+    latest_date = None
+    for i in range(len(dates) - 1, -1, -1):
+        is_limit = bool(is_candidate[i])
+        if is_limit and isinstance(dates[i], str):
+            confirmed = _confirmed_in_pool(stock_code, dates[i])
+            if confirmed is not None:
+                is_limit = confirmed
+        if is_limit:
+            streak_days += 1
+            if latest_date is None:
+                latest_date = dates[i] if isinstance(dates[i], str) else None
+        elif streak_days:
+            break
+    return streak_days, latest_date
 
 def calculate_streak_days(symbol: str, query_date: str) -> int:
     """
@@ -20,229 +140,155 @@ def calculate_streak_days(symbol: str, query_date: str) -> int:
     Returns:
         连板天数，如果无法获取则返回0
     """
+    return calculate_streak_info(symbol, query_date)[0]
+
+def calculate_streak_info(symbol: str, query_date: str) -> Tuple[int, Optional[str]]:
+    """
+    计算连板天数，同时返回计算过程中找到的最近涨停日
+    
+    调用方需要最近涨停日时直接使用，不必再逐日查询涨停板池
+    
+    Args:
+        symbol: 股票代码或名称
+        query_date: 查询日期 (YYYYMMDD)
+        
+    Returns:
+        (连板天数, 最近涨停日YYYYMMDD)；无法获取时连板天数为0，最近涨停日未知时为None
+    """
     try:
         # 首先尝试解析股票代码
         stock_code = None
         
-        # 如果输入看起来像股票代码（6位数字）
-        if re.match(r'^\d{6}$', str(symbol)):
-            stock_code = str(symbol).zfill(6)
+        # 如果输入看起来像股票代码（6位数字），直接用字符串判断，无需正则
+        text = str(symbol)
+        if len(text) == 6 and text.isascii() and text.isdigit():
+            stock_code = text
         else:
             # 尝试使用股票名称解析器
-            try:
-                from stock_name_resolver import get_stock_code_by_name
+            if get_stock_code_by_name is not None:
                 stock_code = get_stock_code_by_name(str(symbol))
                 if stock_code:
-                    print(f"解析股票名称 '{symbol}' 得到代码: {stock_code}")
+                    logger.info("解析股票名称 '%s' 得到代码: %s", symbol, stock_code)
                 else:
                     # 如果解析失败，尝试直接使用输入
                     stock_code = str(symbol).zfill(6)
-            except ImportError:
-                print("无法导入 stock_name_resolver，将直接使用输入")
+            else:
+                logger.warning("无法导入 stock_name_resolver，将直接使用输入")
                 stock_code = str(symbol).zfill(6)
         
         if not stock_code:
-            print(f"无法解析股票代码: {symbol}")
-            return 0
+            logger.warning("无法解析股票代码: %s", symbol)
+            return 0, None
         
         # 首先尝试从 stock_data_fetcher 获取准确的连板信息
-        try:
-            from stock_data_fetcher import get_stock_info
-            stock_info = get_stock_info(stock_code)
-            if stock_info:
-                # 尝试从多个可能的字段中提取连板天数
-                for field in ['连板数', '连续涨停天数', 'streak', '连板天数', '涨停天数', '连板高度']:
-                    if field in stock_info:
-                        value = stock_info[field]
-                        if isinstance(value, (int, float)):
-                            result = int(value)
-                            # 确保结果至少为1（如果今天涨停）
-                            if result >= 1:
-                                print(f"从 stock_data_fetcher 获取到连板天数: {result}")
-                                return result
-                        elif isinstance(value, str):
-                            # 提取数字
-                            match = re.search(r'(\d+)', value)
-                            if match:
-                                result = int(match.group(1))
+        if get_stock_info is None:
+            logger.warning("无法导入 stock_data_fetcher，将使用备用方法")
+        else:
+            try:
+                stock_info = get_stock_info(stock_code)
+                if stock_info:
+                    # 尝试从多个可能的字段中提取连板天数
+                    for field in ['连板数', '连续涨停天数', 'streak', '连板天数', '涨停天数', '连板高度']:
+                        if field in stock_info:
+                            value = stock_info[field]
+                            if isinstance(value, (int, float)):
+                                result = int(value)
+                                # 确保结果至少为1（如果今天涨停）
                                 if result >= 1:
-                                    print(f"从 stock_data_fetcher 字段 {field} 提取到连板天数: {result}")
-                                    return result
-        except ImportError:
-            print("无法导入 stock_data_fetcher，将使用备用方法")
-        except Exception as e:
-            print(f"从 stock_data_fetcher 获取连板天数失败: {e}")
+                                    logger.info("从 stock_data_fetcher 获取到连板天数: %s", result)
+                                    return result, None
+                            elif isinstance(value, str):
+                                # 提取数字
+                                match = _FIRST_INT_RE.search(value)
+                                if match:
+                                    result = int(match.group(1))
+                                    if result >= 1:
+                                        logger.info("从 stock_data_fetcher 字段 %s 提取到连板天数: %s", field, result)
+                                        return result, None
+            except Exception as e:
+                logger.error("从 stock_data_fetcher 获取连板天数失败: %s", e)
+        
+        # 其次用一次日线数据请求计算连板天数
+        history_streak = _compute_streak_from_history(stock_code, query_date)
+        if history_streak is not None and history_streak[0] > 0:
+            logger.info("根据日线数据计算连板天数: %s 当前%s连板", stock_code, history_streak[0])
+            return history_streak
+        if history_streak is not None:
+            # 当天的日线数据可能尚未更新，再查一次当天涨停板池（按日期缓存）
+            try:
+                pool_today = get_limit_pool(query_date)
+            except Exception as e:
+                logger.error("检查今天涨停板池失败: %s", e)
+                pool_today = None
+            if pool_today is None or stock_code not in pool_today['codes']:
+                logger.info("根据日线数据计算连板天数: %s 当前0连板", stock_code)
+                return history_streak
+            streak = pool_today['streaks'].get(stock_code, 0)
+            if streak >= 1:
+                logger.info("从今天涨停板池获取到连板天数: %s", streak)
+                return streak, query_date
+            # 在涨停板池中但没有连板数，退回下面的逐日检查
         
         # 备用方法：使用 akshare 的涨停板池历史数据，改进版
         try:
-            import akshare as ak
-            
             current_date = query_date
             current_dt = datetime.strptime(current_date, '%Y%m%d')
             
             streak_days = 0
+            latest_limit_up_date = None
             max_days_to_check = 30  # 最多检查30个交易日
             
-            print(f"开始使用备用方法计算连板天数: {stock_code}")
+            logger.debug("开始使用备用方法计算连板天数: %s", stock_code)
             
-            # 检查今天是否在涨停板池中
-            today_in_pool = False
+            # 今天在涨停板池中且有连板数时直接使用
             try:
-                df_today = ak.stock_zt_pool_em(date=current_date)
-                if df_today is not None and not df_today.empty:
-                    # 检查列名
-                    code_col = None
-                    for col in ['代码', 'symbol', '股票代码']:
-                        if col in df_today.columns:
-                            code_col = col
-                            break
-                    
-                    if code_col:
-                        # 标准化代码
-                        df_today[code_col] = df_today[code_col].astype(str).str.zfill(6)
-                        codes_today = df_today[code_col].tolist()
-                        if stock_code in codes_today:
-                            today_in_pool = True
-                            # 尝试从今天的数据中获取连板数
-                            if '连板数' in df_today.columns or '连续涨停天数' in df_today.columns:
-                                for col in ['连板数', '连续涨停天数']:
-                                    if col in df_today.columns:
-                                        # 找到该股票的行
-                                        stock_row = df_today[df_today[code_col] == stock_code]
-                                        if not stock_row.empty:
-                                            value = stock_row.iloc[0][col]
-                                            if pd.notna(value):
-                                                try:
-                                                    result = int(value)
-                                                    if result >= 1:
-                                                        print(f"从今天涨停板池获取到连板天数: {result}")
-                                                        return result
-                                                except:
-                                                    pass
-                            streak_days = 1
-                            print(f"  今天 ({current_date}) 涨停，开始向前检查连板")
+                pool_today = get_limit_pool(current_date)
+                if pool_today is not None:
+                    result = pool_today['streaks'].get(stock_code, 0)
+                    if result >= 1:
+                        logger.info("从今天涨停板池获取到连板天数: %s", result)
+                        return result, current_date
             except Exception as e:
-                print(f"检查今天涨停板池失败: {e}")
+                logger.error("检查今天涨停板池失败: %s", e)
             
-            # 如果今天涨停，向前检查历史连板
-            if today_in_pool:
-                for i in range(1, max_days_to_check):
-                    check_date = current_dt - timedelta(days=i)
-                    check_date_str = check_date.strftime('%Y%m%d')
-                    
-                    # 尝试获取该日期的涨停板池数据
-                    try:
-                        df = ak.stock_zt_pool_em(date=check_date_str)
-                        
-                        # 检查是否为空（可能是非交易日）
-                        if df is None or df.empty:
-                            # 可能是非交易日，继续检查前一天
-                            continue
-                        
-                        # 检查股票是否在涨停板池中
-                        code_col = None
-                        for col in ['代码', 'symbol', '股票代码']:
-                            if col in df.columns:
-                                code_col = col
-                                break
-                        
-                        if code_col:
-                            df[code_col] = df[code_col].astype(str).str.zfill(6)
-                            codes_in_pool = df[code_col].tolist()
-                            if stock_code in codes_in_pool:
-                                streak_days += 1
-                                print(f"  发现 {check_date_str} 涨停，当前累计 {streak_days} 连板")
-                            else:
-                                # 遇到未涨停日，停止计数
-                                print(f"  {check_date_str} 未涨停，停止向前检查")
-                                break
-                        else:
-                            # 没有代码列，可能是数据格式问题
-                            print(f"  {check_date_str} 数据格式异常，停止检查")
-                            break
-                            
-                    except Exception as e:
-                        # 获取数据失败，可能是非交易日或网络问题
-                        continue
+            # 从今天起单向向前检查：找到最近一个涨停日后累计连板，遇到第一个未涨停的交易日停止
+            for i in range(max_days_to_check):
+                check_date_str = (current_dt - timedelta(days=i)).strftime('%Y%m%d')
                 
-                # 确保 streak_days 至少为1（今天涨停）
-                if streak_days == 0:
-                    streak_days = 1
-            
-            # 如果今天没涨停，检查昨天是否涨停（可能今天还没收盘）
-            if streak_days == 0:
-                print(f"今天未涨停，检查历史连板")
-                # 从昨天开始向前检查
-                for i in range(max_days_to_check):
-                    check_date = current_dt - timedelta(days=i)
-                    check_date_str = check_date.strftime('%Y%m%d')
-                    
-                    try:
-                        df = ak.stock_zt_pool_em(date=check_date_str)
-                        
-                        if df is None or df.empty:
-                            continue
-                        
-                        code_col = None
-                        for col in ['代码', 'symbol', '股票代码']:
-                            if col in df.columns:
-                                code_col = col
-                                break
-                        
-                        if code_col:
-                            df[code_col] = df[code_col].astype(str).str.zfill(6)
-                            codes_in_pool = df[code_col].tolist()
-                            if stock_code in codes_in_pool:
-                                # 找到涨停日，开始向前检查连板
-                                streak_days = 1
-                                print(f"  发现 {check_date_str} 涨停，开始向前检查连板")
-                                
-                                # 继续向前检查
-                                for j in range(1, max_days_to_check - i):
-                                    prev_date = check_date - timedelta(days=j)
-                                    prev_date_str = prev_date.strftime('%Y%m%d')
-                                    
-                                    try:
-                                        df_prev = ak.stock_zt_pool_em(date=prev_date_str)
-                                        if df_prev is None or df_prev.empty:
-                                            continue
-                                        
-                                        code_col_prev = None
-                                        for col in ['代码', 'symbol', '股票代码']:
-                                            if col in df_prev.columns:
-                                                code_col_prev = col
-                                                break
-                                        
-                                        if code_col_prev:
-                                            df_prev[code_col_prev] = df_prev[code_col_prev].astype(str).str.zfill(6)
-                                            codes_prev = df_prev[code_col_prev].tolist()
-                                            if stock_code in codes_prev:
-                                                streak_days += 1
-                                                print(f"  发现 {prev_date_str} 涨停，当前累计 {streak_days} 连板")
-                                            else:
-                                                break
-                                    except:
-                                        break
-                                break
-                    except:
-                        continue
+                try:
+                    codes_in_pool = get_limit_pool_codes(check_date_str)
+                except Exception:
+                    # 获取数据失败，可能是非交易日或网络问题
+                    continue
+                
+                if codes_in_pool is None:
+                    # 可能是非交易日，继续检查前一天
+                    continue
+                
+                if stock_code in codes_in_pool:
+                    streak_days += 1
+                    if latest_limit_up_date is None:
+                        latest_limit_up_date = check_date_str
+                    logger.debug("  发现 %s 涨停，当前累计 %s 连板", check_date_str, streak_days)
+                elif latest_limit_up_date is not None:
+                    # 连板中断，停止计数
+                    logger.debug("  %s 未涨停，停止向前检查", check_date_str)
+                    break
             
             if streak_days > 0:
-                print(f"备用方法计算完成: {stock_code} 当前{streak_days}连板")
+                logger.info("备用方法计算完成: %s 当前%s连板", stock_code, streak_days)
             else:
-                print(f"备用方法未检测到连板")
+                logger.info("备用方法未检测到连板")
             
-            return streak_days
+            return streak_days, latest_limit_up_date
             
         except Exception as e:
-            print(f"备用方法计算连板天数失败: {e}")
-            import traceback
-            traceback.print_exc()
-            return 0
+            logger.exception("备用方法计算连板天数失败: %s", e)
+            return 0, None
             
     except Exception as e:
-        print(f"获取连板天数失败: {e}")
-        return 0
+        logger.error("获取连板天数失败: %s", e)
+        return 0, None
 
 def _get_streak_days_inline(self, symbol: str) -> int:
     """
@@ -91,6 +91,37 @@ def get_batch_input() -> list:
             print("未找到任何有效股票，请重新输入")
 
 
+def get_multiline_input(prompt: str, end_marker: str = "END") -> str:
+    """
+    获取多行输入，直到遇到结束标记
+    
+    Args:
+        prompt: 提示信息
+        end_marker: 结束标记（用户输入这个标记表示输入结束）
+    
+    Returns:
+        用户输入的多行文本（不包含结束标记）
+    """
+    print(prompt)
+    print(f"输入完成后，请在新的一行单独输入 '{end_marker}' 并按回车结束输入")
+    print("开始输入:")
+    
+    lines = []
+    while True:
+        try:
+            line = input()
+            if line.strip() == end_marker:
+                break
+            lines.append(line)
+        except EOFError:
+            # 用户按Ctrl+D/Ctrl+Z
+            print(f"\n检测到输入结束")
+            break
+    
+    # 清理不可编码字符（终端输入的非法字节会变成代理字符），对整段文本只处理一次
+    return "\n".join(lines).encode('utf-8', 'ignore').decode('utf-8')
+
+
 def confirm_exit() -> bool:
     """确认退出"""
     choice = input("确定要退出吗？(y/n): ").strip().lower()
@@ -69,10 +69,9 @@ def run_quant_strategy():
             from stock_ui_input import get_multiline_input
             user_input = get_multiline_input("", "END")
             
-            # 清理用户输入中的不可编码字符
+            # get_multiline_input已清理不可编码字符
             if user_input.strip():
-                # 先清理输入
-                cleaned_input = user_input.encode('utf-8', 'ignore').decode('utf-8')
+                cleaned_input = user_input
                 print("\n正在从您的分析中总结规律...")
                 print("（这将提取股票代码、日期，获取数据，并让大模型总结规律）")
                 
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""测试配置：把项目根目录加入导入路径（各模块位于根目录）"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
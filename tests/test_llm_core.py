@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""stock_llm_core 响应解析的测试"""
+
+from stock_llm_core import StockLLMCore
+
+
+def test_line_with_two_section_names_uses_section_order():
+    core = StockLLMCore()
+    response = "\n".join([
+        "【风险提示】与【综合结论】",
+        "内容A",
+        "操作建议：见明日预期：",
+        "内容B",
+    ])
+
+    sections = core.parse_llm_response(response)
+
+    # 与逐个章节检查一致：按章节顺序取第一个，而不是取行中最靠前的
+    assert sections["综合结论"] == "内容A"
+    assert sections["风险提示"] == ""
+    assert sections["明日预期"] == "内容B"
+    assert sections["操作建议"] == ""
+
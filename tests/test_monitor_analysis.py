@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""stock_monitor_analysis 批量分析结果汇总的测试"""
+
+from stock_monitor_analysis import StockMonitorAnalysis
+
+
+def _analysis(code, **indicators):
+    base = {
+        '是否涨停': True,
+        '是否有炸板': False,
+        '是否漏单': False,
+        '是否重新封板': False,
+        '是否强势股': True,
+        '炸板次数': 0,
+    }
+    base.update(indicators)
+    return {
+        '涨停异动分析': {'股票代码': code},
+        '关键指标': base,
+        '综合评级': 'A',
+        '投资建议': '封板稳固，可关注次日表现',
+    }
+
+
+def test_collect_batch_results_keeps_malformed_sub_result():
+    monitor = StockMonitorAnalysis()
+    symbols = ['000001', '000002', '000003']
+    analysis_by_key = {
+        '000001': _analysis('000001', 炸板次数=2),
+        # 子分析返回了非数字的炸板次数和None标志，整行仍应保留
+        '000002': _analysis('000002', 炸板次数='未知', 是否漏单=None),
+        '000003': RuntimeError("网络错误"),
+    }
+
+    df = monitor._collect_batch_results(symbols, symbols, analysis_by_key)
+
+    assert df['股票代码'].tolist() == ['000001', '000002']
+    assert df['炸板次数'].tolist() == [2, 0]
+    assert df['是否漏单'].tolist() == [False, False]
+    assert df['是否涨停'].dtype == bool
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""各模块共用的辅助工具"""
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""
+可选的Numba JIT加速
+
+安装了numba时直接使用numba.njit；未安装时njit退化为原样返回函数的装饰器，
+支持@njit和@njit(cache=True)两种写法
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def deco(func):
+            return func
+        return deco if not args or not callable(args[0]) else args[0]
+
+__all__ = ["njit"]